@@ -0,0 +1,114 @@
+"""Benchmark search latency while the upstream is failing.
+
+Runs the same query workload against a local fake ArXiv that answers with
+503s and hangs at configurable rates, once through a plain arxiv.Client
+configured as before the resilience layer (library retries, no timeouts,
+errors swallowed into empty results) and once through ArxivScraper with
+its resilient session. All delays are multiplied by --time-scale so a run
+takes seconds; latencies are reported in the same scaled units.
+
+Usage:
+    python benchmarks/bench_resilience.py --searches 300 --error-rate 0.3 --hang-rate 0.05
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import arxiv
+import numpy as np
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.scraper.arxiv_scraper import ArxivScraper
+from src.scraper.resilience import CircuitBreaker, RetryPolicy, UpstreamUnavailableError
+from tests.fake_arxiv import FakeArxiv
+
+
+def legacy_search(client: arxiv.Client, query: str) -> str:
+    """The pre-resilience search_papers: library retries, no timeout, errors become []."""
+    try:
+        results = list(client.results(arxiv.Search(query=query, max_results=1)))
+    except Exception:
+        results = []
+    return "ok" if results else "empty"
+
+
+def resilient_search(scraper: ArxivScraper, query: str, timeout: float) -> str:
+    stale_before = scraper.session.stats.stale_served
+    try:
+        papers = asyncio.run(scraper.search_papers(query, max_results=1, timeout=timeout))
+    except UpstreamUnavailableError:
+        return "error"
+    if scraper.session.stats.stale_served > stale_before:
+        return "stale"
+    return "ok" if papers else "empty"
+
+
+def run(name, search, queries):
+    latencies = []
+    outcomes = Counter()
+    for query in queries:
+        started = time.perf_counter()
+        outcomes[search(query)] += 1
+        latencies.append(time.perf_counter() - started)
+    latencies = np.array(latencies) * 1000
+    print(
+        f"{name:>10}: p50 {np.percentile(latencies, 50):7.1f} ms  "
+        f"p99 {np.percentile(latencies, 99):7.1f} ms  max {latencies.max():7.1f} ms  "
+        f"total {latencies.sum() / 1000:6.1f} s  "
+        + "  ".join(f"{key} {outcomes[key]}" for key in ("ok", "stale", "empty", "error"))
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--searches", type=int, default=300)
+    parser.add_argument("--distinct-queries", type=int, default=30)
+    parser.add_argument("--error-rate", type=float, default=0.3)
+    parser.add_argument("--hang-rate", type=float, default=0.05)
+    parser.add_argument("--time-scale", type=float, default=0.01,
+                        help="Multiplier applied to every real-world delay (3 s rate limit -> 30 ms)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    scale = args.time_scale
+    logging.disable(logging.CRITICAL)
+
+    rng = random.Random(args.seed)
+    queries = [f"query {rng.randrange(args.distinct_queries)}" for _ in range(args.searches)]
+    print(
+        f"{args.searches} searches, {args.error_rate:.0%} 503s, {args.hang_rate:.0%} hangs "
+        f"of {300 * scale:.1f} s, times scaled by {scale}"
+    )
+
+    for name in ("legacy", "resilient"):
+        with FakeArxiv(
+            error_rate=args.error_rate, hang_rate=args.hang_rate, hang=300 * scale,
+            latency=0.2 * scale, seed=args.seed
+        ) as server:
+            if name == "legacy":
+                client = arxiv.Client(page_size=100, delay_seconds=3 * scale, num_retries=3)
+                client.query_url_format = server.query_url_format
+                run(name, lambda query: legacy_search(client, query), queries)
+            else:
+                scraper = ArxivScraper(
+                    retry_policy=RetryPolicy(
+                        base_delay=3 * scale, max_delay=60 * scale, request_timeout=15 * scale
+                    ),
+                    circuit_breaker=CircuitBreaker(cooldown=30 * scale),
+                )
+                scraper.client.delay_seconds = 3 * scale
+                scraper.client.query_url_format = server.query_url_format
+                run(name, lambda query: resilient_search(scraper, query, timeout=30 * scale), queries)
+
+
+if __name__ == "__main__":
+    main()
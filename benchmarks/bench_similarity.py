@@ -0,0 +1,100 @@
+"""Benchmark related-paper query latency of the similarity index.
+
+Builds an index over synthetic papers whose words follow a Zipf distribution
+(roughly matching abstract vocabularies), then times related() and batched
+query_many() calls against the memory-mapped segment.
+
+Usage:
+    python benchmarks/bench_similarity.py --papers 1000000 --index-dir /tmp/similarity-bench
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.scraper.paper_scraper import PaperMetadata
+from src.scraper.similarity import SimilarityIndex
+
+
+def synthetic_papers(count: int, vocabulary_size: int, words_per_paper: int, seed: int):
+    """Yield papers with Zipf-distributed words."""
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array([f"w{i}" for i in range(vocabulary_size)])
+    for start in range(0, count, 10_000):
+        batch = min(10_000, count - start)
+        word_ids = rng.zipf(1.3, size=(batch, words_per_paper)) % vocabulary_size
+        for offset, row in enumerate(word_ids):
+            number = start + offset
+            words = vocabulary[row]
+            yield PaperMetadata(
+                title=" ".join(words[:10]),
+                authors=[],
+                abstract=" ".join(words[10:]),
+                publication_date="2024-01-01",
+                url=f"http://arxiv.org/abs/{number // 100000:04d}.{number % 100000:05d}",
+            )
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(samples, q) * 1000)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--papers", type=int, default=1_000_000)
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("--words", type=int, default=150)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--index-dir", help="Reuse or create the index here (default: temp dir)")
+    args = parser.parse_args()
+
+    index_dir = Path(args.index_dir or tempfile.mkdtemp(prefix="similarity-bench-")) / "index"
+    index = SimilarityIndex(index_dir, compact_threshold=args.papers + 1)
+    if len(index) < args.papers:
+        started = time.perf_counter()
+        index.add(synthetic_papers(args.papers, args.vocabulary, args.words, seed=0))
+        index.compact()
+        print(f"build {args.papers} papers: {time.perf_counter() - started:.1f}s")
+
+    # Reopen so queries run against the memory-mapped segment
+    index = SimilarityIndex(index_dir)
+    size_mb = sum(f.stat().st_size for f in index_dir.iterdir()) / 1e6
+    print(f"index: {len(index)} papers, {size_mb:.0f} MB on disk")
+
+    rng = np.random.default_rng(1)
+    ids = [index._segment.ids[i].decode() for i in rng.integers(0, len(index), args.queries)]
+    index.related(ids[0], args.k)  # build the id lookup table outside the timings
+
+    latencies = []
+    for paper_id in ids:
+        started = time.perf_counter()
+        index.related(paper_id, args.k)
+        latencies.append(time.perf_counter() - started)
+    print(
+        f"related(k={args.k}): p50 {percentile_ms(latencies, 50):.1f} ms, "
+        f"p99 {percentile_ms(latencies, 99):.1f} ms"
+    )
+
+    texts = [" ".join(f"w{w}" for w in rng.zipf(1.3, 150) % args.vocabulary) for _ in range(args.queries)]
+    started = time.perf_counter()
+    index.query_many(texts, args.k)
+    elapsed = time.perf_counter() - started
+    print(f"query_many({args.queries}): {elapsed * 1000 / args.queries:.1f} ms/query")
+
+    if not args.index_dir:
+        shutil.rmtree(index_dir.parent)
+
+
+if __name__ == "__main__":
+    main()
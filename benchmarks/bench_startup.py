@@ -0,0 +1,97 @@
+"""Benchmark cold-start cost: import time and time to first search result.
+
+Each measurement runs in a fresh interpreter. Import times are the median
+of --runs processes. Time to first result is measured against a local fake
+ArXiv that adds --connect-ms to every new connection, standing in for the
+DNS and TLS setup a fresh process pays before its first real request. A
+cold process searches right away; a prewarmed one calls prewarm() at
+startup and searches after --idle-ms, like a user typing their first query.
+The reported total runs from process start to the first result, excluding
+that idle time.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 7 --connect-ms 150
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from tests.fake_arxiv import FakeArxiv
+
+MODULES = (
+    "src.scraper.paper_scraper",
+    "src.scraper.arxiv_scraper",
+    "src.cli",
+    "src.main",
+)
+
+FIRST_RESULT = """
+import asyncio, json, time
+started = time.perf_counter()
+from src.scraper.arxiv_scraper import ArxivScraper
+imported = time.perf_counter()
+scraper = ArxivScraper()
+scraper.client.query_url_format = {url!r}
+idle = 0.0
+if {prewarm!r}:
+    scraper.prewarm()
+    time.sleep({idle!r})
+    idle = {idle!r}
+searched = time.perf_counter()
+papers = asyncio.run(scraper.search_papers("anything", max_results=1))
+done = time.perf_counter()
+assert papers
+print(json.dumps({{"import": imported - started, "search": done - searched, "total": done - started - idle}}))
+"""
+
+
+def run_python(code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=project_root, capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip().splitlines()[-1]
+
+
+def import_time(module: str) -> float:
+    return float(run_python(
+        f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+    ))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--connect-ms", type=float, default=150.0)
+    parser.add_argument("--idle-ms", type=float, default=500.0)
+    args = parser.parse_args()
+
+    print(f"Import time (median of {args.runs} fresh processes):")
+    for module in MODULES:
+        timings = [import_time(module) for _ in range(args.runs)]
+        print(f"  {module:<28} {statistics.median(timings) * 1000:7.1f} ms")
+
+    print(f"Time to first result ({args.connect_ms:.0f} ms connection setup, median of {args.runs}):")
+    with FakeArxiv(connect_delay=args.connect_ms / 1000) as server:
+        for name, prewarm in (("cold", False), ("prewarmed", True)):
+            code = FIRST_RESULT.format(url=server.query_url_format, prewarm=prewarm, idle=args.idle_ms / 1000)
+            runs = [json.loads(run_python(code)) for _ in range(args.runs)]
+            imported = statistics.median(run["import"] for run in runs) * 1000
+            search = statistics.median(run["search"] for run in runs) * 1000
+            total = statistics.median(run["total"] for run in runs) * 1000
+            print(
+                f"  {name:<10} import {imported:6.1f} ms  first search {search:7.1f} ms  "
+                f"total {total:7.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
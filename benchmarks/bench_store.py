@@ -0,0 +1,148 @@
+"""Benchmark compression ratio and random-read latency of the paper store.
+
+Writes synthetic papers (Zipf-distributed words drawn from a pronounceable
+vocabulary, realistic ArXiv IDs, URLs, dates and author lists) to a store,
+then times open(), point lookups of random IDs and batched lookups. Real
+abstracts share far more phrasing than Zipf samples, so real stores compress
+better than reported here.
+
+Usage:
+    python benchmarks/bench_store.py --papers 2000000 --store-dir /tmp/paper-store
+"""
+
+import argparse
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.scraper.paper_scraper import PaperMetadata
+from src.scraper.store import DEFAULT_BLOCK_SIZE, PaperStore
+
+SYLLABLES = "ka to ri su me no pa lu gi ve tra con ment ion al ic ous ter pro ing".split()
+
+
+def arxiv_id(number: int) -> str:
+    month = number // 20_000
+    return f"{15 + month // 12:02d}{month % 12 + 1:02d}.{number % 20_000:05d}"
+
+
+def synthetic_papers(count: int, vocabulary_size: int, seed: int):
+    """Yield papers with Zipf-distributed title and abstract words."""
+    rng = np.random.default_rng(seed)
+    pick = random.Random(seed)
+    vocabulary = [
+        "".join(pick.choice(SYLLABLES) for _ in range(pick.randint(1, 4)))
+        for _ in range(vocabulary_size)
+    ]
+    surnames = [word.capitalize() for word in vocabulary[:5000]]
+    for start in range(0, count, 10_000):
+        batch = min(10_000, count - start)
+        words = rng.zipf(1.3, size=(batch, 170)) % vocabulary_size
+        abstract_lengths = rng.integers(80, 160, size=batch)
+        author_counts = rng.integers(1, 8, size=batch)
+        for offset in range(batch):
+            number = start + offset
+            paper_id = arxiv_id(number)
+            row = [vocabulary[word] for word in words[offset]]
+            yield PaperMetadata(
+                title=" ".join(row[:10]).capitalize(),
+                authors=[
+                    f"{pick.choice('ABCDEFGHJKLMNPRST')}. {pick.choice(surnames)}"
+                    for _ in range(author_counts[offset])
+                ],
+                abstract=" ".join(row[10:10 + abstract_lengths[offset]]) + ".",
+                publication_date=f"20{paper_id[:2]}-{paper_id[2:4]}-{number % 28 + 1:02d}",
+                doi=f"10.1103/PhysRev.{number}" if number % 5 == 0 else None,
+                url=f"http://arxiv.org/abs/{paper_id}v1",
+                pdf_url=f"http://arxiv.org/pdf/{paper_id}v1",
+            )
+
+
+def percentile_us(samples, q):
+    return float(np.percentile(samples, q) * 1e6)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--papers", type=int, default=2_000_000)
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--store-dir", help="Reuse or create the store here (default: temp dir)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    tmp_dir = None
+    if args.store_dir:
+        store_dir = Path(args.store_dir)
+    else:
+        tmp_dir = tempfile.mkdtemp(prefix="paper-store-bench-")
+        store_dir = Path(tmp_dir) / "store"
+
+    try:
+        if not (store_dir / "meta.json").exists():
+            started = time.perf_counter()
+            PaperStore.write(
+                store_dir, synthetic_papers(args.papers, args.vocabulary, args.seed),
+                block_size=args.block_size
+            ).close()
+            print(f"Wrote {args.papers} papers in {time.perf_counter() - started:.1f} s")
+
+        started = time.perf_counter()
+        store = PaperStore(store_dir, cached_blocks=0)
+        print(f"Opened store in {(time.perf_counter() - started) * 1000:.2f} ms")
+
+        meta = store.meta
+        stored = meta["block_bytes"] + meta["dictionary_bytes"] + store.index_bytes
+        mb = 1024 * 1024
+        print(
+            f"{len(store)} papers, {meta['n_blocks']} blocks of {meta['block_size']}: "
+            f"JSON lines {meta['json_bytes'] / mb:.0f} MB, binary records {meta['record_bytes'] / mb:.0f} MB, "
+            f"store {stored / mb:.0f} MB (blocks {meta['block_bytes'] / mb:.0f} MB, "
+            f"dictionary {meta['dictionary_bytes'] / 1024:.0f} KB, index {store.index_bytes / mb:.0f} MB)"
+        )
+        print(
+            f"Compression: {store.compression_ratio:.2f}x vs JSON lines, "
+            f"{meta['record_bytes'] / meta['block_bytes']:.2f}x on binary records, "
+            f"{stored / len(store):.0f} bytes/paper"
+        )
+
+        rng = np.random.default_rng(args.seed + 1)
+        ids = [arxiv_id(int(n)) for n in rng.integers(0, len(store), size=args.lookups)]
+        for paper_id in ids[:1000]:  # warm the page cache
+            store.get(paper_id)
+        latencies = []
+        for paper_id in ids:
+            started = time.perf_counter()
+            paper = store.get(paper_id)
+            latencies.append(time.perf_counter() - started)
+            assert paper is not None
+        print(
+            f"Random get(): p50 {percentile_us(latencies, 50):.0f} us  "
+            f"p99 {percentile_us(latencies, 99):.0f} us  "
+            f"({len(latencies) / sum(latencies):,.0f} lookups/s)"
+        )
+
+        started = time.perf_counter()
+        for start in range(0, len(ids), 100):
+            store.get_many(ids[start:start + 100])
+        elapsed = time.perf_counter() - started
+        print(f"get_many() in batches of 100: {len(ids) / elapsed:,.0f} lookups/s")
+        store.close()
+    finally:
+        if tmp_dir:
+            shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
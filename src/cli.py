@@ -0,0 +1,190 @@
+"""Command-line interface for the paper scraper.
+
+Usage:
+    python -m src.cli export "quantum computing" -o papers.parquet --max-results 5000
+    python -m src.cli subscriptions add "quantum error correction" --delivery file --target new.jsonl
+    python -m src.cli subscriptions poll
+"""
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.scraper.arxiv_scraper import ArxivScraper
+from src.scraper.exporters import DEFAULT_BATCH_SIZE, EXPORTERS, export_papers
+from src.scraper.resilience import UpstreamUnavailableError
+from src.scraper.subscriptions import DEFAULT_INTERVAL_MINUTES, SubscriptionManager
+
+SUBSCRIPTIONS_DIR = os.environ.get("SUBSCRIPTIONS_DIR", "data/subscriptions")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for all subcommands"""
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export = subparsers.add_parser("export", help="Stream search results into a file")
+    export.add_argument("query", help="ArXiv search query")
+    export.add_argument("-o", "--output", required=True, help="Output file path")
+    export.add_argument(
+        "-f", "--format", choices=sorted(EXPORTERS),
+        help="Export format (default: inferred from the output suffix)"
+    )
+    export.add_argument(
+        "-c", "--compression",
+        help='Compression codec, or "none" (default: the format\'s default)'
+    )
+    export.add_argument(
+        "-n", "--max-results", type=int, default=None,
+        help="Maximum number of papers to export (default: all)"
+    )
+    export.add_argument("--start-date", help="Earliest submission date, YYYY-MM-DD")
+    export.add_argument("--end-date", help="Latest submission date, YYYY-MM-DD")
+    export.add_argument("--sort-by", choices=["relevance", "date"], default="relevance")
+    export.add_argument(
+        "--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+        help="Papers per written batch / row group"
+    )
+    export.set_defaults(handler=run_export)
+
+    subscriptions = subparsers.add_parser("subscriptions", help="Manage saved-query subscriptions")
+    subscriptions.add_argument(
+        "--state-dir", default=SUBSCRIPTIONS_DIR,
+        help="Directory holding subscriptions, cursors and inboxes"
+    )
+    actions = subscriptions.add_subparsers(dest="action", required=True)
+
+    add = actions.add_parser("add", help="Register a saved query")
+    add.add_argument("query", help="ArXiv search query")
+    add.add_argument("-n", "--max-results", type=int, default=50, help="Papers delivered by the first poll")
+    add.add_argument("--start-date", help="Earliest submission date, YYYY-MM-DD")
+    add.add_argument("--end-date", help="Latest submission date, YYYY-MM-DD")
+    add.add_argument("--delivery", choices=["inbox", "file", "webhook"], default="inbox")
+    add.add_argument("--target", help="Output file for file delivery, URL for webhook delivery")
+    add.add_argument("--interval", type=int, default=DEFAULT_INTERVAL_MINUTES, help="Minutes between polls")
+    add.set_defaults(handler=run_subscription_add)
+
+    remove = actions.add_parser("remove", help="Delete a subscription")
+    remove.add_argument("subscription_id")
+    remove.set_defaults(handler=run_subscription_remove)
+
+    listing = actions.add_parser("list", help="Show subscriptions and polling stats")
+    listing.set_defaults(handler=run_subscription_list)
+
+    poll = actions.add_parser("poll", help="Poll due subscriptions once (for cron)")
+    poll.add_argument("--all", action="store_true", help="Poll every subscription regardless of schedule")
+    poll.set_defaults(handler=run_subscription_poll)
+
+    run = actions.add_parser("run", help="Keep polling due subscriptions")
+    run.add_argument("--check-seconds", type=float, default=60.0)
+    run.set_defaults(handler=run_subscription_loop)
+
+    return parser
+
+
+def _date_range(args: argparse.Namespace) -> Optional[dict]:
+    if bool(args.start_date) != bool(args.end_date):
+        raise ValueError("--start-date and --end-date must be given together")
+    if not args.start_date:
+        return None
+    return {"start_date": args.start_date, "end_date": args.end_date}
+
+
+def run_export(args: argparse.Namespace) -> int:
+    """Run the export subcommand"""
+    papers = ArxivScraper().iter_papers(
+        args.query,
+        max_results=args.max_results,
+        date_range=_date_range(args),
+        sort_by=args.sort_by
+    )
+    count = export_papers(
+        papers,
+        args.output,
+        fmt=args.format,
+        compression=args.compression,
+        batch_size=args.batch_size
+    )
+    print(f"Exported {count} papers to {args.output}")
+    return 0
+
+
+def run_subscription_add(args: argparse.Namespace) -> int:
+    """Register a subscription"""
+    subscription = SubscriptionManager(args.state_dir).register(
+        args.query,
+        max_results=args.max_results,
+        date_range=_date_range(args),
+        delivery=args.delivery,
+        target=args.target,
+        interval_minutes=args.interval
+    )
+    print(f"Registered subscription {subscription.id}")
+    return 0
+
+
+def run_subscription_remove(args: argparse.Namespace) -> int:
+    """Delete a subscription"""
+    if not SubscriptionManager(args.state_dir).remove(args.subscription_id):
+        print(f"No subscription {args.subscription_id}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def run_subscription_list(args: argparse.Namespace) -> int:
+    """Print subscriptions and how many upstream requests polling has saved"""
+    manager = SubscriptionManager(args.state_dir)
+    for subscription in manager.subscriptions.values():
+        cursor = " ".join(subscription.cursor) if subscription.cursor else "-"
+        print(
+            f"{subscription.id}  {subscription.query!r}  -> {subscription.delivery}"
+            f"  cursor: {cursor}  next poll: {subscription.next_poll_at or 'now'}"
+        )
+    stats = manager.stats
+    print(
+        f"{stats.polls} polls: {stats.upstream_requests} upstream requests "
+        f"(naive re-querying: {stats.naive_requests}, saved: {stats.requests_saved}), "
+        f"{stats.entries_fetched} entries fetched (naive: {stats.naive_entries}), "
+        f"{stats.papers_delivered} papers delivered"
+    )
+    return 0
+
+
+def run_subscription_poll(args: argparse.Namespace) -> int:
+    """Poll subscriptions once"""
+    manager = SubscriptionManager(args.state_dir)
+    delivered = manager.poll() if args.all else manager.poll_due()
+    for subscription_id, count in delivered.items():
+        print(f"{subscription_id}: {count} new papers")
+    return 0
+
+
+def run_subscription_loop(args: argparse.Namespace) -> int:
+    """Poll due subscriptions until interrupted"""
+    try:
+        SubscriptionManager(args.state_dir).run(check_seconds=args.check_seconds)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO)
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except (ValueError, ImportError, UpstreamUnavailableError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,9 +15,22 @@ if project_root not in sys.path:
 
 from src.scraper.arxiv_scraper import ArxivScraper
 from src.scraper.paper_scraper import PaperMetadata
+from src.scraper.resilience import UpstreamUnavailableError
 
-# Initialize scraper
-scraper = ArxivScraper()
+# Give up on a search rather than leave the page spinning
+SEARCH_TIMEOUT_SECONDS = 30
+
+
+@st.cache_resource
+def get_scraper() -> ArxivScraper:
+    """Create one scraper per server process, warmed up in the background.
+
+    Streamlit re-runs this script on every interaction, so a module-level
+    scraper would be rebuilt (and its connections and caches lost) each time.
+    """
+    scraper = ArxivScraper()
+    scraper.prewarm()
+    return scraper
 
 
 def run_async(coro):
@@ -48,6 +61,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# Start connecting to ArXiv while the user types their first query
+scraper = get_scraper()
+
 # Title and description
 st.title("📚 ArXiv Paper Search")
 st.markdown("""
@@ -119,11 +135,16 @@ if st.button("🔍 Search Papers"):
             }
             
             # Perform the search with date range
-            papers = run_async(scraper.search_papers(
-                search_query, 
-                max_results=max_results,
-                date_range=date_range
-            ))
+            try:
+                papers = run_async(scraper.search_papers(
+                    search_query, 
+                    max_results=max_results,
+                    date_range=date_range,
+                    timeout=SEARCH_TIMEOUT_SECONDS
+                ))
+            except UpstreamUnavailableError:
+                st.error("ArXiv is currently unavailable. Please try again in a few minutes.")
+                st.stop()
             
             if papers:
                 # Filter papers by date
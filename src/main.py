@@ -0,0 +1,112 @@
+"""FastAPI backend exposing the paper scraper over HTTP."""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from datetime import date
+from typing import List, Optional
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from src.scraper.arxiv_scraper import ArxivScraper
+from src.scraper.authors import AuthorIndex
+from src.scraper.exporters import DEFAULT_BATCH_SIZE, EXPORTERS, resolve_exporter, stream_export
+from src.scraper.resilience import UpstreamUnavailableError
+from src.scraper.similarity import SimilarityIndex
+
+SIMILARITY_INDEX_DIR = os.environ.get("SIMILARITY_INDEX_DIR", "data/similarity")
+AUTHOR_INDEX_PATH = os.environ.get("AUTHOR_INDEX_PATH", "data/authors.jsonl")
+
+# Set PREWARM=0 to skip opening ArXiv connections and loading indexes at startup
+PREWARM = os.environ.get("PREWARM", "1") != "0"
+
+# Index files are read by prewarm() at startup, or on first use when PREWARM=0
+scraper = ArxivScraper(
+    similarity_index=SimilarityIndex(SIMILARITY_INDEX_DIR),
+    author_index=AuthorIndex(AUTHOR_INDEX_PATH),
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the scraper in the background so startup is not delayed; persist indexes on shutdown."""
+    if PREWARM:
+        scraper.prewarm()
+    yield
+    scraper.similarity_index.save()
+    scraper.author_index.save()
+
+
+app = FastAPI(title="ArXiv Paper Scraper", lifespan=lifespan)
+
+
+@app.exception_handler(UpstreamUnavailableError)
+async def upstream_unavailable(request: Request, exc: UpstreamUnavailableError) -> JSONResponse:
+    """Report ArXiv outages as 503 instead of an empty result."""
+    headers = {}
+    if exc.retry_after is not None:
+        headers["Retry-After"] = str(max(1, round(exc.retry_after)))
+    return JSONResponse({"detail": str(exc)}, status_code=503, headers=headers)
+
+
+@app.get("/export")
+def export(
+    query: str,
+    format: str = Query("jsonl", description=f"One of {sorted(EXPORTERS)}"),
+    compression: Optional[str] = None,
+    max_results: Optional[int] = Query(None, ge=1),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    sort_by: str = Query("relevance", pattern="^(relevance|date)$"),
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1),
+) -> StreamingResponse:
+    """Stream search results as a JSONL, CSV, Parquet or Arrow download."""
+    if bool(start_date) != bool(end_date):
+        raise HTTPException(400, "start_date and end_date must be given together")
+
+    # Validate format and compression up front so errors surface as a 400
+    # rather than in the middle of a streamed body
+    try:
+        exporter_cls, _ = resolve_exporter(format, compression)
+    except (ValueError, ImportError) as e:
+        raise HTTPException(400, str(e))
+
+    date_range = (
+        {"start_date": start_date.isoformat(), "end_date": end_date.isoformat()}
+        if start_date else None
+    )
+    papers = scraper.iter_papers(
+        query, max_results=max_results, date_range=date_range, sort_by=sort_by
+    )
+    return StreamingResponse(
+        stream_export(papers, format, compression, batch_size),
+        media_type=exporter_cls.media_type,
+        headers={"Content-Disposition": f'attachment; filename="papers.{format}"'},
+    )
+
+
+@app.get("/paper/{paper_id:path}/related")
+def related(paper_id: str, k: int = Query(10, ge=1, le=100)) -> dict:
+    """Return papers similar to the given one from the local similarity index."""
+    # Scoring and any fetch of an unindexed paper block, so this runs in
+    # FastAPI's threadpool rather than on the event loop
+    papers = asyncio.run(scraper.related(paper_id, k))
+    return {
+        "paper_id": paper_id,
+        "related": [{"paper_id": related_id, "score": score} for related_id, score in papers],
+    }
+
+
+@app.get("/authors/papers")
+def papers_by_authors(
+    start_date: date,
+    author: List[str] = Query(..., min_length=1),
+    end_date: Optional[date] = None,
+) -> dict:
+    """Return papers by any of the given authors, fetching only uncovered date ranges."""
+    # The scraper blocks on ArXiv and index I/O, so this runs in FastAPI's
+    # threadpool rather than on the event loop
+    papers = asyncio.run(scraper.papers_by_authors(author, start_date, end_date))
+    return {"papers": [asdict(paper) for paper in papers]}
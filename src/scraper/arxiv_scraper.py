@@ -1,37 +1,118 @@
-from typing import List, Optional, Dict, Literal
+import threading
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Dict, Literal, Sequence, Tuple, Union
 
-import arxiv
-from datetime import datetime
-from .paper_scraper import PaperMetadata, PaperScraper
+from datetime import date, datetime
+from .authors import normalize_author
+from .paper_scraper import PaperMetadata, PaperScraper, get_paper_id, normalize_paper_id
+from .resilience import CircuitBreaker, RetryPolicy, UpstreamUnavailableError, allow_stale, deadline
+
+if TYPE_CHECKING:
+    # arxiv (and requests), numpy and scipy are imported on first use, not at import time
+    import arxiv
+    from .authors import AuthorIndex
+    from .session import ResilientSession
+    from .similarity import SimilarityIndex
 
 SortOption = Literal["date", "authors", "title", "relevance"]
 
+# Authors OR-ed into one upstream query; keeps the query string well under ArXiv's limits
+AUTHOR_QUERY_BATCH_SIZE = 20
+# Paper IDs looked up per id_list query; one full page of results
+ID_QUERY_BATCH_SIZE = 100
+# ArXiv occasionally answers 200 with an empty page mid-pagination; the
+# resilient session cannot see that, so the arxiv client retries those itself
+EMPTY_PAGE_RETRIES = 2
+
 class ArxivScraper(PaperScraper):
     """Scraper implementation for fetching paper metadata from ArXiv."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        similarity_index: Optional["SimilarityIndex"] = None,
+        author_index: Optional["AuthorIndex"] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
         super().__init__()
-        self.client = arxiv.Client(
-            page_size=100,
-            delay_seconds=3,  # Rate limiting
-            num_retries=3
-        )
+        # Papers returned by searches, fetches and polls are added to these local indexes
+        self.similarity_index = similarity_index
+        self.author_index = author_index
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self._client: Optional["arxiv.Client"] = None
+        self._client_lock = threading.Lock()
+        self._prewarm_started = False
+        self._prewarm_thread: Optional[threading.Thread] = None
         
-        # Mapping of our sort options to ArXiv's sort criteria
+        # Mapping of our sort options to ArXiv's sort criteria (arxiv.SortCriterion names)
         self.sort_criteria = {
-            "relevance": arxiv.SortCriterion.Relevance,
-            "date": arxiv.SortCriterion.LastUpdatedDate,
+            "relevance": "Relevance",
+            "date": "LastUpdatedDate",
             # Authors and title sorting will be handled post-fetch
             # as ArXiv API doesn't support these directly
         }
 
+    @property
+    def client(self) -> "arxiv.Client":
+        """The ArXiv API client, created on first use so importing the scraper stays cheap."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    import arxiv
+                    from .session import ResilientSession
+
+                    client = arxiv.Client(
+                        page_size=100,
+                        delay_seconds=3,  # Rate limiting
+                        # Failed requests are retried by the resilient session below;
+                        # these retries only matter for unexpectedly empty pages
+                        num_retries=EMPTY_PAGE_RETRIES
+                    )
+                    # arxiv.Client has no transport hook, so swap in our session directly
+                    client._session = ResilientSession(self.retry_policy, self.circuit_breaker)
+                    self._client = client
+        return self._client
+
+    @property
+    def session(self) -> "ResilientSession":
+        """The resilient HTTP session used for every ArXiv request."""
+        return self.client._session
+
+    def prewarm(self, background: bool = True) -> Optional[threading.Thread]:
+        """
+        Pay start-up costs before the first search instead of during it.
+
+        Imports the ArXiv client, opens a pooled connection to the API host
+        (DNS and TLS setup), pages in the similarity index and reads the
+        author index file. Safe to call more
+        than once; only the first call does any work. Failures are logged
+        and otherwise ignored, since the first real request will retry.
+
+        Args:
+            background: Warm up in a daemon thread and return immediately
+
+        Returns:
+            The warm-up thread when running in the background, else None
+        """
+        with self._client_lock:
+            if self._prewarm_started:
+                return self._prewarm_thread if background else None
+            self._prewarm_started = True
+        if not background:
+            self._prewarm()
+            return None
+        self._prewarm_thread = threading.Thread(target=self._prewarm, name="arxiv-prewarm", daemon=True)
+        self._prewarm_thread.start()
+        return self._prewarm_thread
+
     async def search_papers(
         self, 
         query: str, 
         max_results: int = 10,
         date_range: Optional[Dict[str, str]] = None,
         sort_by: SortOption = "relevance",
-        ascending: bool = False
+        ascending: bool = False,
+        timeout: Optional[float] = None
     ) -> List[PaperMetadata]:
         """
         Search for papers on ArXiv using a query string.
@@ -42,54 +123,157 @@ class ArxivScraper(PaperScraper):
             date_range: Optional dict with 'start_date' and 'end_date' in YYYY-MM-DD format
             sort_by: How to sort the results ("date", "authors", "title", "relevance")
             ascending: Whether to sort in ascending order
+            timeout: Optional overall deadline in seconds for all upstream requests
             
         Returns:
             List of PaperMetadata objects
+
+        Raises:
+            UpstreamUnavailableError: If ArXiv is unhealthy and no stale result is cached
         """
         try:
-            # Construct date filter if provided
-            if date_range:
-                date_filter = (
-                    f"submittedDate:[{date_range['start_date']} TO {date_range['end_date']}]"
-                )
-                # Combine with original query
-                query = f"{query} AND {date_filter}"
-
-            # Use API-level sorting for supported criteria
-            sort_criterion = self.sort_criteria.get(sort_by, arxiv.SortCriterion.Relevance)
-            
-            search = arxiv.Search(
-                query=query,
-                max_results=max_results,
-                sort_by=sort_criterion
-            )
+            with deadline(timeout), allow_stale():
+                search = self._build_search(query, max_results, date_range, sort_by)
+                papers = [self._to_metadata(result) for result in self._results(search)]
+                self._index_papers(papers)
 
-            papers = []
-            for result in self.client.results(search):
-                paper = PaperMetadata(
-                    title=result.title,
-                    authors=[author.name for author in result.authors],
-                    abstract=result.summary,
-                    publication_date=result.published.strftime("%Y-%m-%d"),
-                    doi=None,  # ArXiv papers might not have a DOI
-                    url=result.entry_id,
-                    citations=None,  # ArXiv API doesn't provide citation count
-                    pdf_url=result.pdf_url
-                )
-                papers.append(paper)
-
-            # Handle client-side sorting for unsupported criteria
-            if sort_by not in self.sort_criteria:
-                papers = self._sort_papers(papers, sort_by, ascending)
-            elif not ascending and sort_by == "date":  # ArXiv API returns ascending by default
-                papers.reverse()
+                # Handle client-side sorting for unsupported criteria
+                if sort_by not in self.sort_criteria:
+                    papers = self._sort_papers(papers, sort_by, ascending)
+                elif not ascending and sort_by == "date":  # ArXiv API returns ascending by default
+                    papers.reverse()
 
-            return papers
+                return papers
 
+        except UpstreamUnavailableError as e:
+            self.logger.error(f"ArXiv unavailable while searching papers: {str(e)}")
+            raise
         except Exception as e:
             self.logger.error(f"Error searching ArXiv papers: {str(e)}")
             return []
 
+    def iter_papers(
+        self,
+        query: str,
+        max_results: Optional[int] = None,
+        date_range: Optional[Dict[str, str]] = None,
+        sort_by: SortOption = "relevance"
+    ) -> Iterator[PaperMetadata]:
+        """
+        Lazily yield papers matching a query, one page at a time.
+
+        Unlike search_papers, results are never collected into a list, so
+        consumers such as the exporters can handle arbitrarily large result
+        sets in constant memory. Only API-level sort criteria are honoured.
+        Papers are not added to the local indexes: bulk exports would grow
+        them by whole result sets and rebuild the similarity segment each time.
+
+        Args:
+            query: Search query string
+            max_results: Maximum number of results to yield (None for all)
+            date_range: Optional dict with 'start_date' and 'end_date' in YYYY-MM-DD format
+            sort_by: How to sort the results ("date" or "relevance")
+
+        Yields:
+            PaperMetadata objects
+
+        Raises:
+            UpstreamUnavailableError: If ArXiv becomes unhealthy mid-stream. This and
+                any other error propagate, so a truncated export is never mistaken
+                for a complete one
+        """
+        try:
+            search = self._build_search(query, max_results, date_range, sort_by)
+            for result in self._results(search):
+                yield self._to_metadata(result)
+        except Exception as e:
+            self.logger.error(f"Error streaming ArXiv papers: {str(e)}")
+            raise
+
+    def iter_newest_papers(
+        self,
+        query: str,
+        date_range: Optional[Dict[str, str]] = None,
+        max_results: Optional[int] = None
+    ) -> Iterator[PaperMetadata]:
+        """
+        Lazily yield papers matching a query, newest submission first.
+
+        Pages are requested only as the caller consumes results, so a poller
+        that stops at the start of its lookback window never fetches further
+        pages. Errors are raised rather than logged so callers can
+        tell a failed poll from one with no new papers.
+
+        Args:
+            query: Search query string
+            date_range: Optional dict with 'start_date' and 'end_date' in YYYY-MM-DD format
+            max_results: Maximum number of results to yield (None for all). Pages
+                are still requested at the client's page_size
+
+        Yields:
+            PaperMetadata objects
+        """
+        import arxiv
+
+        search = self._build_search(query, max_results, date_range, "relevance")
+        search.sort_by = arxiv.SortCriterion.SubmittedDate
+        search.sort_order = arxiv.SortOrder.Descending
+        for result in self._results(search):
+            paper = self._to_metadata(result)
+            self._index_papers([paper])
+            yield paper
+
+    def _build_search(
+        self,
+        query: str,
+        max_results: Optional[int],
+        date_range: Optional[Dict[str, str]],
+        sort_by: SortOption
+    ) -> "arxiv.Search":
+        """Build an arxiv.Search for the query, date filter and sort option"""
+        import arxiv
+
+        # Construct date filter if provided, in ArXiv's documented YYYYMMDDTTTT
+        # form; the end bound runs to 23:59 so the whole last day is included
+        if date_range:
+            start = date.fromisoformat(date_range['start_date']).strftime("%Y%m%d")
+            end = date.fromisoformat(date_range['end_date']).strftime("%Y%m%d")
+            date_filter = f"submittedDate:[{start}0000 TO {end}2359]"
+            # Combine with original query
+            query = f"{query} AND {date_filter}"
+
+        # Use API-level sorting for supported criteria
+        sort_criterion = arxiv.SortCriterion[self.sort_criteria.get(sort_by, "Relevance")]
+
+        return arxiv.Search(
+            query=query,
+            max_results=max_results,
+            sort_by=sort_criterion
+        )
+
+    def _results(self, search: "arxiv.Search") -> Iterator["arxiv.Result"]:
+        """Yield search results, treating a page that stays empty after retries as an outage"""
+        import arxiv
+
+        try:
+            yield from self.client.results(search)
+        except arxiv.UnexpectedEmptyPageError as e:
+            raise UpstreamUnavailableError(f"ArXiv kept returning an empty page: {str(e)}") from e
+
+    @staticmethod
+    def _to_metadata(result: "arxiv.Result") -> PaperMetadata:
+        """Convert an arxiv.Result into PaperMetadata"""
+        return PaperMetadata(
+            title=result.title,
+            authors=[author.name for author in result.authors],
+            abstract=result.summary,
+            publication_date=result.published.strftime("%Y-%m-%d"),
+            doi=None,  # ArXiv papers might not have a DOI
+            url=result.entry_id,
+            citations=None,  # ArXiv API doesn't provide citation count
+            pdf_url=result.pdf_url
+        )
+
     def _sort_papers(
         self,
         papers: List[PaperMetadata],
@@ -109,39 +293,206 @@ class ArxivScraper(PaperScraper):
             )
         return papers
 
-    async def fetch_paper_by_id(self, arxiv_id: str) -> Optional[PaperMetadata]:
+    async def fetch_paper_by_id(
+        self,
+        arxiv_id: str,
+        timeout: Optional[float] = None
+    ) -> Optional[PaperMetadata]:
         """
         Fetch a specific paper by its ArXiv ID.
         
         Args:
             arxiv_id: The ArXiv ID of the paper
+            timeout: Optional overall deadline in seconds for all upstream requests
             
         Returns:
             PaperMetadata object if successful, None otherwise
+
+        Raises:
+            UpstreamUnavailableError: If ArXiv is unhealthy and no stale result is cached
         """
-        try:
-            search = arxiv.Search(
-                id_list=[arxiv_id],
-                max_results=1
-            )
+        import arxiv
 
-            results = list(self.client.results(search))
-            if results:
-                result = results[0]
-                return PaperMetadata(
-                    title=result.title,
-                    authors=[author.name for author in result.authors],
-                    abstract=result.summary,
-                    publication_date=result.published.strftime("%Y-%m-%d"),
-                    doi=None,
-                    url=result.entry_id,
-                    citations=None,
-                    pdf_url=result.pdf_url
+        try:
+            with deadline(timeout), allow_stale():
+                search = arxiv.Search(
+                    id_list=[arxiv_id],
+                    max_results=1
                 )
 
-            return None
+                results = list(self._results(search))
+                if results:
+                    paper = self._to_metadata(results[0])
+                    self._index_papers([paper])
+                    return paper
+
+                return None
 
+        except UpstreamUnavailableError as e:
+            self.logger.error(f"ArXiv unavailable while fetching paper {arxiv_id}: {str(e)}")
+            raise
         except Exception as e:
             self.logger.error(f"Error fetching ArXiv paper {arxiv_id}: {str(e)}")
             return None
 
+    async def related(
+        self,
+        paper_id: str,
+        k: int = 10,
+        timeout: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Find papers similar to the given one using the local similarity index.
+
+        Papers not yet indexed are fetched from ArXiv once and added first;
+        the similarity search itself never contacts ArXiv.
+
+        Args:
+            paper_id: The ArXiv ID of the paper
+            k: Maximum number of related papers to return
+            timeout: Optional overall deadline in seconds for all upstream requests
+
+        Returns:
+            List of (paper_id, score) pairs, most similar first
+
+        Raises:
+            UpstreamUnavailableError: If the paper must be fetched and ArXiv is unhealthy
+        """
+        if self.similarity_index is None:
+            self.logger.error("Related papers requested but no similarity index is configured")
+            return []
+
+        try:
+            with deadline(timeout):
+                paper_id = normalize_paper_id(paper_id)
+                if paper_id not in self.similarity_index:
+                    paper = await self.fetch_paper_by_id(paper_id)
+                    if paper is None:
+                        return []
+                return self.similarity_index.related(paper_id, k)
+
+        except UpstreamUnavailableError as e:
+            self.logger.error(f"ArXiv unavailable while finding papers related to {paper_id}: {str(e)}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Error finding papers related to {paper_id}: {str(e)}")
+            return []
+
+    async def papers_by_authors(
+        self,
+        authors: Sequence[str],
+        start_date: Union[str, date],
+        end_date: Optional[Union[str, date]] = None,
+        timeout: Optional[float] = None
+    ) -> List[PaperMetadata]:
+        """
+        Fetch papers by any of the given authors, answering from the local author index.
+
+        Only date ranges not yet fetched for an author are requested from ArXiv,
+        and authors missing the same range share one OR-ed query, so checking a
+        watch list daily costs one request per AUTHOR_QUERY_BATCH_SIZE authors.
+        The index keeps only postings on disk, so indexed papers whose metadata
+        is not cached (after a restart, say) are fetched by ID in batches.
+
+        Args:
+            authors: Author names in any spelling ('J. Smith', 'Smith, John', ...)
+            start_date: Earliest submission date, as a date or in YYYY-MM-DD format
+            end_date: Latest submission date, as a date or in YYYY-MM-DD format (default: today)
+            timeout: Optional overall deadline in seconds for all upstream requests
+
+        Returns:
+            List of PaperMetadata objects, newest first
+
+        Raises:
+            ValueError: If a date is malformed
+            UpstreamUnavailableError: If a missing range must be fetched and ArXiv is unhealthy
+        """
+        if self.author_index is None:
+            self.logger.error("Author query requested but no author index is configured")
+            return []
+
+        # Parse dates up front so a malformed one is reported, not answered with no papers
+        if not isinstance(start_date, date):
+            start_date = date.fromisoformat(start_date)
+        if end_date is None:
+            end_date = date.today()
+        elif not isinstance(end_date, date):
+            end_date = date.fromisoformat(end_date)
+        try:
+            with deadline(timeout):
+                # Group authors that are missing the same date range
+                pending: Dict[Tuple[date, date], List[str]] = {}
+                for author in authors:
+                    for gap in self.author_index.missing_ranges(author, start_date, end_date):
+                        pending.setdefault(gap, []).append(author)
+
+                for (gap_start, gap_end), gap_authors in pending.items():
+                    for i in range(0, len(gap_authors), AUTHOR_QUERY_BATCH_SIZE):
+                        self._fetch_author_range(
+                            gap_authors[i:i + AUTHOR_QUERY_BATCH_SIZE], gap_start, gap_end
+                        )
+
+                paper_ids = self.author_index.paper_ids_by(authors, start_date, end_date)
+                return self._papers_by_ids(paper_ids)
+
+        except UpstreamUnavailableError as e:
+            self.logger.error(f"ArXiv unavailable while fetching papers by authors: {str(e)}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Error fetching papers by authors: {str(e)}")
+            return []
+
+    def _fetch_author_range(self, authors: Sequence[str], start: date, end: date) -> None:
+        """Fetch every paper by the authors in a date range and record the coverage"""
+        keys = list(dict.fromkeys(key for key in map(normalize_author, authors) if key))
+        if not keys:
+            return
+        query = " OR ".join(f"au:{key}" for key in keys)
+        search = self._build_search(
+            f"({query})",
+            None,
+            {"start_date": start.isoformat(), "end_date": end.isoformat()},
+            "date"
+        )
+        papers = [self._to_metadata(result) for result in self._results(search)]
+        self._index_papers(papers)
+        self.author_index.mark_covered(authors, start, end)
+
+    def _papers_by_ids(self, paper_ids: Sequence[str]) -> List[PaperMetadata]:
+        """Look up indexed papers in order, fetching ones not cached by the author index by ID"""
+        import arxiv
+
+        papers = {paper_id: self.author_index.get(paper_id) for paper_id in paper_ids}
+        missing = [paper_id for paper_id, paper in papers.items() if paper is None]
+        for i in range(0, len(missing), ID_QUERY_BATCH_SIZE):
+            batch = missing[i:i + ID_QUERY_BATCH_SIZE]
+            search = arxiv.Search(id_list=batch, max_results=len(batch))
+            fetched = [self._to_metadata(result) for result in self._results(search)]
+            self._index_papers(fetched)
+            for paper in fetched:
+                if get_paper_id(paper) in papers:
+                    papers[get_paper_id(paper)] = paper
+        return [paper for paper in papers.values() if paper is not None]
+
+    def _prewarm(self) -> None:
+        try:
+            self.session.warm(self.client.query_url_format)
+            if self.similarity_index is not None:
+                self.similarity_index.warm()
+            if self.author_index is not None:
+                self.author_index.warm()
+        except Exception as e:
+            self.logger.warning(f"Error prewarming ArXiv scraper: {str(e)}")
+
+    def _index_papers(self, papers: Iterable[PaperMetadata]) -> None:
+        """Add papers to the configured local indexes"""
+        if self.similarity_index is None and self.author_index is None:
+            return
+        papers = list(papers)
+        try:
+            if self.similarity_index is not None:
+                self.similarity_index.add(papers)
+            if self.author_index is not None:
+                self.author_index.add(papers)
+        except Exception as e:
+            self.logger.error(f"Error indexing papers: {str(e)}")
@@ -0,0 +1,346 @@
+"""Author index over locally seen papers.
+
+Author names are reduced to normalized keys ("surname_initial", ASCII-folded),
+each with a date-ordered posting list of paper IDs and a co-author adjacency
+count. The index also records which date ranges have been fully fetched from
+upstream for each author, so author-centric queries only need to request the
+ranges that are still missing.
+"""
+
+import bisect
+import heapq
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter, OrderedDict, defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .paper_scraper import PaperMetadata, get_paper_id
+
+DateRange = Tuple[date, date]
+
+# Papers show up in the API days after their submission date (announcements
+# skip weekends and holidays), so the most recent days are never marked covered
+ANNOUNCEMENT_LAG_DAYS = 7
+DEFAULT_CACHED_PAPERS = 10_000
+
+SURNAME_PARTICLES = frozenset({
+    "al", "bin", "da", "dal", "de", "del", "della", "der", "di", "dos", "du",
+    "el", "la", "le", "st", "ten", "ter", "van", "von", "zu",
+})
+NAME_SUFFIXES = frozenset({"jr", "sr", "ii", "iii", "iv"})
+_NAME_PART = re.compile(r"[a-z][a-z\-]*")
+
+
+def normalize_author(name: str) -> str:
+    """
+    Reduce an author name to a lookup key.
+
+    'John R. Smith', 'J. Smith' and 'Smith, John' all map to 'smith_j';
+    diacritics are folded ('Müller' -> 'muller') and surname particles are
+    kept ('Ludwig van Beethoven' -> 'van_beethoven_l'). This matches the
+    'Surname_I' form accepted by ArXiv's au: search field.
+
+    Returns:
+        The key, or an empty string if the name has no letters
+    """
+    text = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii").lower()
+    if "," in text:
+        surname, _, given = text.partition(",")
+        text = f"{given} {surname}"
+    text = text.replace("'", "").replace(".", " ")
+    parts = [part.strip("-") for part in _NAME_PART.findall(text)]
+    parts = [part for part in parts if part and part not in NAME_SUFFIXES]
+    if not parts:
+        return ""
+
+    surname_start = len(parts) - 1
+    while surname_start > 1 and parts[surname_start - 1] in SURNAME_PARTICLES:
+        surname_start -= 1
+    surname = "_".join(parts[surname_start:])
+    if surname_start == 0:
+        return surname
+    return f"{surname}_{parts[0][0]}"
+
+
+def _parse_date(value: Union[str, date]) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+class AuthorIndex:
+    """
+    Author-to-papers index with per-author upstream coverage.
+
+    Posting lists hold (publication_date, paper_id) pairs in ascending order,
+    so date-bounded lookups are two bisections and multi-author lookups are a
+    heap merge of the relevant slices. Only postings and coverage are
+    persisted: each add() and mark_covered() appends JSON lines to the index
+    file when a path is set, and save() rewrites it compactly. The file is
+    read on first use or by warm(), not when the index is created. Full paper
+    metadata is kept in a bounded in-memory cache; callers fetch evicted or
+    pre-restart papers by ID.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        announcement_lag_days: int = ANNOUNCEMENT_LAG_DAYS,
+        cached_papers: int = DEFAULT_CACHED_PAPERS
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path) if path is not None else None
+        self.announcement_lag_days = announcement_lag_days
+        self.cached_papers = cached_papers
+
+        self._lock = threading.RLock()
+        self._dates: Dict[str, str] = {}
+        self._authors: Dict[str, List[str]] = {}
+        self._papers: "OrderedDict[str, PaperMetadata]" = OrderedDict()
+        self._postings: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        self._coauthors: Dict[str, Counter] = defaultdict(Counter)
+        self._names: Dict[str, Counter] = defaultdict(Counter)
+        self._coverage: Dict[str, List[DateRange]] = {}
+        self._loaded = False
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._dates)
+
+    def __contains__(self, paper_id: str) -> bool:
+        self._ensure_loaded()
+        return paper_id in self._dates
+
+    def warm(self) -> None:
+        """Load the index file now rather than on first use."""
+        self._ensure_loaded()
+
+    def add(self, papers: Iterable[PaperMetadata]) -> int:
+        """
+        Index papers by author and cache their metadata.
+
+        Papers already indexed only refresh the cache.
+
+        Returns:
+            Number of papers added
+        """
+        records = []
+        with self._lock:
+            self._ensure_loaded()
+            for paper in papers:
+                paper_id = get_paper_id(paper)
+                self._cache(paper_id, paper)
+                if paper_id in self._dates:
+                    continue
+                self._index_paper(paper_id, paper.publication_date, paper.authors)
+                records.append({"id": paper_id, "date": paper.publication_date, "authors": paper.authors})
+            self._append(records)
+        return len(records)
+
+    def get(self, paper_id: str) -> Optional[PaperMetadata]:
+        """Cached metadata for an indexed paper, or None if it is not in the cache."""
+        with self._lock:
+            paper = self._papers.get(paper_id)
+            if paper is not None:
+                self._papers.move_to_end(paper_id)
+            return paper
+
+    def paper_ids_by(
+        self,
+        authors: Sequence[str],
+        start_date: Optional[Union[str, date]] = None,
+        end_date: Optional[Union[str, date]] = None
+    ) -> List[str]:
+        """
+        Return IDs of papers by any of the given authors, newest first.
+
+        Args:
+            authors: Author names in any supported spelling
+            start_date: Optional earliest publication date (inclusive)
+            end_date: Optional latest publication date (inclusive)
+
+        Returns:
+            Deduplicated list of paper IDs
+        """
+        low = _parse_date(start_date).isoformat() if start_date else ""
+        high = _parse_date(end_date).isoformat() if end_date else "\uffff"
+        with self._lock:
+            self._ensure_loaded()
+            slices = []
+            for key in {normalize_author(author) for author in authors}:
+                postings = self._postings.get(key, [])
+                start = bisect.bisect_left(postings, (low, ""))
+                end = bisect.bisect_right(postings, (high, "\uffff"))
+                slices.append(reversed(postings[start:end]))
+
+            seen = set()
+            paper_ids = []
+            for _, paper_id in heapq.merge(*slices, reverse=True):
+                if paper_id not in seen:
+                    seen.add(paper_id)
+                    paper_ids.append(paper_id)
+        return paper_ids
+
+    def coauthors(self, author: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """
+        Return an author's most frequent co-authors.
+
+        Returns:
+            List of (display name, number of shared papers) pairs
+        """
+        with self._lock:
+            self._ensure_loaded()
+            counts = self._coauthors.get(normalize_author(author), Counter())
+            return [(self.display_name(key), count) for key, count in counts.most_common(limit)]
+
+    def display_name(self, key: str) -> str:
+        """Most common spelling seen for a normalized author key."""
+        self._ensure_loaded()
+        names = self._names.get(key)
+        return names.most_common(1)[0][0] if names else key
+
+    def missing_ranges(
+        self,
+        author: str,
+        start_date: Union[str, date],
+        end_date: Union[str, date]
+    ) -> List[DateRange]:
+        """Date ranges within [start_date, end_date] not yet fetched for an author."""
+        start, end = _parse_date(start_date), _parse_date(end_date)
+        gaps = []
+        with self._lock:
+            self._ensure_loaded()
+            for covered_start, covered_end in self._coverage.get(normalize_author(author), []):
+                if covered_end < start:
+                    continue
+                if covered_start > end:
+                    break
+                if covered_start > start:
+                    gaps.append((start, covered_start - timedelta(days=1)))
+                start = max(start, covered_end + timedelta(days=1))
+        if start <= end:
+            gaps.append((start, end))
+        return gaps
+
+    def mark_covered(
+        self,
+        authors: Sequence[str],
+        start_date: Union[str, date],
+        end_date: Union[str, date]
+    ) -> None:
+        """
+        Record that all papers by the authors in a date range have been fetched.
+
+        Coverage never extends into the last announcement_lag_days days, since
+        papers submitted then may not have been announced yet; those days are
+        fetched again on every query.
+        """
+        start = _parse_date(start_date)
+        end = min(_parse_date(end_date), date.today() - timedelta(days=self.announcement_lag_days))
+        if start > end:
+            return
+        keys = list(dict.fromkeys(key for key in map(normalize_author, authors) if key))
+        with self._lock:
+            self._ensure_loaded()
+            for key in keys:
+                self._cover(key, start, end)
+            self._append([{"covered": keys, "start": start.isoformat(), "end": end.isoformat()}])
+
+    def save(self) -> None:
+        """Rewrite the index file with one line per paper and per covered author."""
+        if self.path is None:
+            return
+        with self._lock:
+            self._ensure_loaded()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for paper_id, publication_date in self._dates.items():
+                    record = {"id": paper_id, "date": publication_date, "authors": self._authors[paper_id]}
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                for key, ranges in self._coverage.items():
+                    for start, end in ranges:
+                        record = {"covered": [key], "start": start.isoformat(), "end": end.isoformat()}
+                        f.write(json.dumps(record) + "\n")
+            os.replace(tmp_path, self.path)
+
+    def _cache(self, paper_id: str, paper: PaperMetadata) -> None:
+        self._papers[paper_id] = paper
+        self._papers.move_to_end(paper_id)
+        while len(self._papers) > self.cached_papers:
+            self._papers.popitem(last=False)
+
+    def _cover(self, key: str, start: date, end: date) -> None:
+        ranges = sorted(self._coverage.get(key, []) + [(start, end)])
+        merged = [ranges[0]]
+        for range_start, range_end in ranges[1:]:
+            last_start, last_end = merged[-1]
+            if range_start <= last_end + timedelta(days=1):
+                merged[-1] = (last_start, max(last_end, range_end))
+            else:
+                merged.append((range_start, range_end))
+        self._coverage[key] = merged
+
+    def _index_paper(
+        self,
+        paper_id: str,
+        publication_date: str,
+        authors: List[str],
+        keep_sorted: bool = True
+    ) -> None:
+        self._dates[paper_id] = publication_date
+        self._authors[paper_id] = authors
+        keys = []
+        for name in authors:
+            key = normalize_author(name)
+            if key and key not in keys:
+                keys.append(key)
+                self._names[key][name] += 1
+        entry = (publication_date, paper_id)
+        for key in keys:
+            if keep_sorted:
+                bisect.insort(self._postings[key], entry)
+            else:
+                self._postings[key].append(entry)
+            self._coauthors[key].update(other for other in keys if other != key)
+
+    def _append(self, records: List[dict]) -> None:
+        if self.path is None or not records:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if not self._loaded:
+                if self.path is not None and self.path.exists():
+                    self._load()
+                self._loaded = True
+
+    def _load(self) -> None:
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A line cut short by a crash mid-append
+                    self.logger.warning("Skipping malformed line in %s", self.path)
+                    continue
+                if "covered" in record:
+                    start, end = date.fromisoformat(record["start"]), date.fromisoformat(record["end"])
+                    for key in record["covered"]:
+                        self._cover(key, start, end)
+                elif record["id"] not in self._dates:
+                    self._index_paper(record["id"], record["date"], record["authors"], keep_sorted=False)
+        for postings in self._postings.values():
+            postings.sort()
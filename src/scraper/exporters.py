@@ -0,0 +1,428 @@
+"""Streaming writers for exporting paper metadata to JSONL, CSV, Parquet and Arrow."""
+
+import csv
+import gzip
+import io
+import json
+import os
+from dataclasses import asdict, fields
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
+
+from .paper_scraper import PaperMetadata
+
+DEFAULT_BATCH_SIZE = 1000
+FIELD_NAMES = [field.name for field in fields(PaperMetadata)]
+AUTHOR_SEPARATOR = "; "
+
+
+class PaperExporter:
+    """
+    Base class for incremental paper writers.
+
+    Papers are buffered until batch_size of them have been collected and then
+    written out as one batch (a row group for the columnar formats), so memory
+    stays bounded by the batch size no matter how many papers are exported.
+    The sink is never closed by the exporter.
+    """
+
+    media_type = "application/octet-stream"
+    compressions: tuple = (None,)
+    default_compression: Optional[str] = None
+
+    def __init__(
+        self,
+        sink: BinaryIO,
+        compression: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        if compression not in self.compressions:
+            raise ValueError(
+                f"Unsupported compression {compression!r} for {type(self).__name__}; "
+                f"expected one of {self.compressions}"
+            )
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        self.sink = sink
+        self.compression = compression
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self._batch: List[PaperMetadata] = []
+        self._closed = False
+
+    def write(self, paper: PaperMetadata) -> None:
+        """Queue a paper, writing out the batch once it is full."""
+        self._batch.append(paper)
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def write_all(self, papers: Iterable[PaperMetadata]) -> int:
+        """Write every paper from an iterable and return the running row count."""
+        for paper in papers:
+            self.write(paper)
+        return self.rows_written + len(self._batch)
+
+    def flush(self) -> None:
+        """Write out any buffered papers as one batch."""
+        if not self._batch:
+            return
+        self._write_batch(self._batch)
+        self.rows_written += len(self._batch)
+        self._batch = []
+
+    def close(self) -> None:
+        """Flush remaining papers and finalize the output format."""
+        if self._closed:
+            return
+        self.flush()
+        self._finish()
+        self._closed = True
+
+    def __enter__(self) -> "PaperExporter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _write_batch(self, papers: List[PaperMetadata]) -> None:
+        raise NotImplementedError
+
+    def _finish(self) -> None:
+        """Write any trailer the format requires."""
+
+
+class _TextExporter(PaperExporter):
+    """Shared plumbing for line-oriented text formats with optional gzip."""
+
+    compressions = (None, "gzip")
+
+    def __init__(
+        self,
+        sink: BinaryIO,
+        compression: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        super().__init__(sink, compression, batch_size)
+        self._stream = (
+            gzip.GzipFile(fileobj=sink, mode="wb") if compression == "gzip" else sink
+        )
+
+    def _write_batch(self, papers: List[PaperMetadata]) -> None:
+        self._stream.write(self._encode(papers).encode("utf-8"))
+
+    def _finish(self) -> None:
+        if self._stream is not self.sink:
+            self._stream.close()
+
+    def _encode(self, papers: List[PaperMetadata]) -> str:
+        raise NotImplementedError
+
+
+class JSONLExporter(_TextExporter):
+    """Write one JSON object per line."""
+
+    media_type = "application/x-ndjson"
+
+    def _encode(self, papers: List[PaperMetadata]) -> str:
+        return "".join(
+            json.dumps(asdict(paper), ensure_ascii=False) + "\n" for paper in papers
+        )
+
+
+class CSVExporter(_TextExporter):
+    """Write a header row followed by one row per paper; authors are '; '-joined."""
+
+    media_type = "text/csv"
+
+    def __init__(
+        self,
+        sink: BinaryIO,
+        compression: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        super().__init__(sink, compression, batch_size)
+        self._stream.write(self._rows_to_text([FIELD_NAMES]).encode("utf-8"))
+
+    def _encode(self, papers: List[PaperMetadata]) -> str:
+        rows = []
+        for paper in papers:
+            row = asdict(paper)
+            row["authors"] = AUTHOR_SEPARATOR.join(paper.authors)
+            rows.append([row[name] for name in FIELD_NAMES])
+        return self._rows_to_text(rows)
+
+    @staticmethod
+    def _rows_to_text(rows: List[list]) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        return buffer.getvalue()
+
+
+def _require_pyarrow():
+    """Import pyarrow on demand so the text formats work without it."""
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow is required for Parquet and Arrow export: pip install pyarrow"
+        ) from e
+    return pyarrow
+
+
+def _arrow_schema(pa):
+    return pa.schema([
+        ("title", pa.string()),
+        ("authors", pa.list_(pa.string())),
+        ("abstract", pa.string()),
+        ("publication_date", pa.string()),
+        ("doi", pa.string()),
+        ("url", pa.string()),
+        ("citations", pa.int64()),
+        ("pdf_url", pa.string()),
+    ])
+
+
+class _ColumnarExporter(PaperExporter):
+    """Shared plumbing for pyarrow-backed formats; each batch becomes a record batch."""
+
+    def __init__(
+        self,
+        sink: BinaryIO,
+        compression: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        super().__init__(sink, compression, batch_size)
+        self._pa = _require_pyarrow()
+        self._schema = _arrow_schema(self._pa)
+
+    def _record_batch(self, papers: List[PaperMetadata]):
+        columns = {name: [getattr(paper, name) for paper in papers] for name in FIELD_NAMES}
+        return self._pa.RecordBatch.from_pydict(columns, schema=self._schema)
+
+
+class ParquetExporter(_ColumnarExporter):
+    """Write a Parquet file with one row group per batch."""
+
+    media_type = "application/vnd.apache.parquet"
+    compressions = (None, "snappy", "gzip", "brotli", "lz4", "zstd")
+    default_compression = "snappy"
+
+    def __init__(
+        self,
+        sink: BinaryIO,
+        compression: Optional[str] = "snappy",
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        super().__init__(sink, compression, batch_size)
+        import pyarrow.parquet as pq
+
+        self._writer = pq.ParquetWriter(
+            sink, self._schema, compression=compression or "none"
+        )
+
+    def _write_batch(self, papers: List[PaperMetadata]) -> None:
+        self._writer.write_batch(self._record_batch(papers), row_group_size=len(papers))
+
+    def _finish(self) -> None:
+        self._writer.close()
+
+
+class ArrowExporter(_ColumnarExporter):
+    """Write an Arrow IPC file with one record batch per batch."""
+
+    media_type = "application/vnd.apache.arrow.file"
+    compressions = (None, "lz4", "zstd")
+
+    def __init__(
+        self,
+        sink: BinaryIO,
+        compression: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+        super().__init__(sink, compression, batch_size)
+        options = self._pa.ipc.IpcWriteOptions(compression=compression)
+        self._writer = self._pa.ipc.new_file(sink, self._schema, options=options)
+
+    def _write_batch(self, papers: List[PaperMetadata]) -> None:
+        self._writer.write_batch(self._record_batch(papers))
+
+    def _finish(self) -> None:
+        self._writer.close()
+
+
+EXPORTERS: Dict[str, Type[PaperExporter]] = {
+    "jsonl": JSONLExporter,
+    "csv": CSVExporter,
+    "parquet": ParquetExporter,
+    "arrow": ArrowExporter,
+}
+
+EXTENSIONS = {
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+}
+
+
+def resolve_exporter(
+    fmt: str,
+    compression: Optional[str] = None
+) -> Tuple[Type[PaperExporter], Optional[str]]:
+    """
+    Validate a format and compression choice without writing anything.
+
+    Args:
+        fmt: One of "jsonl", "csv", "parquet", "arrow"
+        compression: Codec name, "none" to disable, or None for the format's default
+
+    Returns:
+        Tuple of (exporter class, resolved compression)
+    """
+    if fmt not in EXPORTERS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {sorted(EXPORTERS)}")
+    exporter_cls = EXPORTERS[fmt]
+    if compression is None:
+        compression = exporter_cls.default_compression
+    elif compression == "none":
+        compression = None
+    if compression not in exporter_cls.compressions:
+        raise ValueError(
+            f"Unsupported compression {compression!r} for {fmt}; "
+            f"expected one of {exporter_cls.compressions}"
+        )
+    if issubclass(exporter_cls, _ColumnarExporter):
+        _require_pyarrow()
+    return exporter_cls, compression
+
+
+def get_exporter(
+    fmt: str,
+    sink: BinaryIO,
+    compression: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> PaperExporter:
+    """
+    Create an exporter for the given format.
+
+    Args:
+        fmt: One of "jsonl", "csv", "parquet", "arrow"
+        sink: Binary file-like object to write to
+        compression: Codec name, "none" to disable, or None for the format's default
+        batch_size: Number of papers per written batch / row group
+
+    Returns:
+        A PaperExporter writing to sink
+    """
+    exporter_cls, compression = resolve_exporter(fmt, compression)
+    return exporter_cls(sink, compression=compression, batch_size=batch_size)
+
+
+def format_from_path(path: Union[str, Path]) -> str:
+    """Infer an export format from a file name, ignoring a trailing .gz."""
+    suffixes = [suffix.lower() for suffix in Path(path).suffixes]
+    if suffixes and suffixes[-1] == ".gz":
+        suffixes = suffixes[:-1]
+    if not suffixes or suffixes[-1] not in EXTENSIONS:
+        raise ValueError(f"Cannot infer export format from {str(path)!r}")
+    return EXTENSIONS[suffixes[-1]]
+
+
+def export_papers(
+    papers: Iterable[PaperMetadata],
+    path: Union[str, Path],
+    fmt: Optional[str] = None,
+    compression: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> int:
+    """
+    Stream papers into a file.
+
+    Papers are written to a temporary file next to path, which replaces path
+    only once every paper is written, so a failed export never leaves a
+    truncated file that looks complete.
+
+    Args:
+        papers: Any iterable of papers, e.g. ArxivScraper.iter_papers(...)
+        path: Output file path
+        fmt: Export format; inferred from the path suffix if omitted
+        compression: Codec name, "none" to disable, or None for the format's default
+        batch_size: Number of papers per written batch / row group
+
+    Returns:
+        Number of papers written
+    """
+    fmt = fmt or format_from_path(path)
+    tmp_path = Path(f"{path}.tmp")
+    try:
+        with open(tmp_path, "wb") as sink:
+            with get_exporter(fmt, sink, compression, batch_size) as exporter:
+                exporter.write_all(papers)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return exporter.rows_written
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only sink that collects bytes until drained."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_export(
+    papers: Iterable[PaperMetadata],
+    fmt: str,
+    compression: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[bytes]:
+    """
+    Encode papers incrementally, yielding the output bytes batch by batch.
+
+    Suitable as the body of a streamed HTTP download: at most one batch of
+    papers and its encoded bytes are held in memory at a time.
+
+    Args:
+        papers: Any iterable of papers
+        fmt: Export format
+        compression: Codec name, "none" to disable, or None for the format's default
+        batch_size: Number of papers per written batch / row group
+
+    Yields:
+        Chunks of the encoded output
+    """
+    sink = _ChunkSink()
+    exporter = get_exporter(fmt, sink, compression, batch_size)
+    for paper in papers:
+        exporter.write(paper)
+        chunk = sink.drain()
+        if chunk:
+            yield chunk
+    exporter.close()
+    tail = sink.drain()
+    if tail:
+        yield tail
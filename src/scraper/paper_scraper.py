@@ -1,11 +1,13 @@
 """Module for scraping academic paper metadata from various online sources."""
 
 import logging
+import re
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
-import requests
-from bs4 import BeautifulSoup
+if TYPE_CHECKING:
+    # requests and bs4 are only needed by fetch_paper, so they are imported there
+    from bs4 import BeautifulSoup
 
 
 @dataclass
@@ -22,6 +24,36 @@ class PaperMetadata:
     pdf_url: Optional[str] = None
 
 
+_ARXIV_ABS_MARKER = "arxiv.org/abs/"
+# New-style (2103.13916) and old-style (hep-th/9901001, math.GT/0309136) arXiv IDs
+_ARXIV_ID = re.compile(r"(\d{4}\.\d{4,5}|[a-z\-]+(?:\.[A-Z]{2})?/\d{7})(?:v\d+)?")
+
+
+def normalize_paper_id(paper_id: str) -> str:
+    """
+    Strip whitespace, and the version suffix of arXiv IDs ('2103.13916v2' -> '2103.13916').
+
+    Other identifiers such as DOIs are kept as they are, so '10.48550/abc.v2'
+    stays distinct from '10.48550/abc.'.
+    """
+    paper_id = paper_id.strip()
+    match = _ARXIV_ID.fullmatch(paper_id)
+    return match.group(1) if match else paper_id
+
+
+def get_paper_id(paper: PaperMetadata) -> str:
+    """
+    Return a stable identifier for a paper.
+
+    ArXiv papers are keyed by their versionless arXiv ID taken from the abs URL;
+    other papers fall back to DOI, then URL, then title. Either way the ID is
+    passed through normalize_paper_id, as lookups are.
+    """
+    if paper.url and _ARXIV_ABS_MARKER in paper.url:
+        return normalize_paper_id(paper.url.split(_ARXIV_ABS_MARKER, 1)[1])
+    return normalize_paper_id(paper.doi or paper.url or paper.title)
+
+
 class PaperScraper:
     """Class for scraping academic paper metadata from web pages."""
 
@@ -45,6 +77,9 @@ class PaperScraper:
         Returns:
             PaperMetadata object if successful, None otherwise
         """
+        import requests
+        from bs4 import BeautifulSoup
+
         try:
             response = requests.get(url, headers=self.headers, timeout=30)
             response.raise_for_status()
@@ -67,24 +102,24 @@ class PaperScraper:
             self.logger.error("Error fetching paper from %s: %s", url, str(e))
             return None
 
-    def _extract_title(self, soup: BeautifulSoup) -> str:
+    def _extract_title(self, soup: "BeautifulSoup") -> str:
         """Extract paper title from the page."""
         # Implementation will depend on the specific website structure
 
         raise NotImplementedError
 
-    def _extract_authors(self, soup: BeautifulSoup) -> List[str]:
+    def _extract_authors(self, soup: "BeautifulSoup") -> List[str]:
         """Extract author list from the page."""
         raise NotImplementedError
 
-    def _extract_abstract(self, soup: BeautifulSoup) -> str:
+    def _extract_abstract(self, soup: "BeautifulSoup") -> str:
         """Extract paper abstract from the page."""
         raise NotImplementedError
 
-    def _extract_date(self, soup: BeautifulSoup) -> str:
+    def _extract_date(self, soup: "BeautifulSoup") -> str:
         """Extract publication date from the page."""
         raise NotImplementedError
 
-    def _extract_doi(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_doi(self, soup: "BeautifulSoup") -> Optional[str]:
         """Extract DOI if available."""
         raise NotImplementedError
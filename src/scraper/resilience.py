@@ -0,0 +1,205 @@
+"""Resilience policy for upstream HTTP calls: deadlines, retries and circuit breaking.
+
+These building blocks are applied to every ArXiv request by ResilientSession
+(see session.py). Every request gets a per-attempt timeout bounded by the
+caller's deadline, retries 429/5xx responses and connection errors with
+jittered exponential backoff (honouring Retry-After), and is short-circuited
+while a circuit breaker considers the upstream unhealthy. When a request
+cannot succeed, UpstreamUnavailableError is raised so callers can tell an
+outage from an empty result. Inside an allow_stale() block, the last good
+response for the same URL is served instead if one is cached.
+
+This module only uses the standard library, so importing it (for example
+to catch UpstreamUnavailableError) does not pull in requests.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Deque, Iterator, Optional
+
+_deadline: ContextVar[Optional[float]] = ContextVar("upstream_deadline", default=None)
+_allow_stale: ContextVar[bool] = ContextVar("upstream_allow_stale", default=False)
+
+
+class UpstreamUnavailableError(Exception):
+    """Raised when the upstream service cannot answer within the caller's budget."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class DeadlineExceededError(UpstreamUnavailableError):
+    """Raised when the caller's deadline expires before a request succeeds."""
+
+
+class CircuitOpenError(UpstreamUnavailableError):
+    """Raised without contacting the upstream while the circuit breaker is open."""
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Bound every upstream request made inside the block to finish within seconds.
+
+    Nested deadlines can only tighten the enclosing one. None leaves the
+    current deadline (if any) unchanged.
+    """
+    if seconds is None:
+        yield
+        return
+    expires = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        expires = min(expires, current)
+    token = _deadline.set(expires)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current deadline, or None if there is none."""
+    expires = _deadline.get()
+    return None if expires is None else expires - time.monotonic()
+
+
+@contextmanager
+def allow_stale() -> Iterator[None]:
+    """
+    Let upstream requests made inside the block fall back to cached responses.
+
+    Meant for self-contained lookups. Paginated streams, subscription polls
+    and author coverage fetches must not mix an old page into fresh ones, so
+    they run outside this block and fail with UpstreamUnavailableError.
+    """
+    token = _allow_stale.set(True)
+    try:
+        yield
+    finally:
+        _allow_stale.reset(token)
+
+
+def stale_allowed() -> bool:
+    """Whether the current context accepts stale upstream responses."""
+    return _allow_stale.get()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given as delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass
+class RetryPolicy:
+    """Retry and timeout budget for a single logical upstream request."""
+
+    max_attempts: int = 4
+    base_delay: float = 3.0  # ArXiv asks clients to wait 3 seconds between requests
+    max_delay: float = 60.0
+    request_timeout: float = 15.0
+
+    def backoff(self, attempt: int, error_rate: float) -> float:
+        """
+        Jittered exponential backoff that grows with the observed error rate.
+
+        The ceiling doubles per attempt and is scaled by up to 2x when every
+        recent call has failed; the delay is drawn uniformly between
+        base_delay and the ceiling so concurrent clients spread out.
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt) * (1.0 + error_rate))
+        return random.uniform(self.base_delay, max(self.base_delay, ceiling))
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open breaker over a sliding window of recent calls.
+
+    The circuit opens when at least failure_ratio of the last window calls
+    failed (after min_calls), stays open for cooldown seconds or the
+    upstream's Retry-After if longer, then lets a single probe through.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        window: int = 20,
+        min_calls: int = 5,
+        failure_ratio: float = 0.5,
+        cooldown: float = 30.0
+    ):
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._open_until = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return self._outcomes.count(False) / len(self._outcomes)
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until the breaker will let a probe through."""
+        return max(0.0, self._open_until - time.monotonic())
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() >= self._open_until:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._outcomes.append(True)
+            if self.state != self.CLOSED:
+                self.state = self.CLOSED
+                self._outcomes.clear()
+
+    def record_failure(self, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+            should_open = self.state == self.HALF_OPEN or (
+                len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.failure_ratio
+            )
+            if should_open:
+                self.state = self.OPEN
+                self._open_until = time.monotonic() + max(self.cooldown, retry_after or 0.0)
+                self._probe_in_flight = False
@@ -0,0 +1,184 @@
+"""requests.Session applying the resilience policy to every upstream request."""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceededError,
+    RetryPolicy,
+    UpstreamUnavailableError,
+    parse_retry_after,
+    remaining_time,
+    stale_allowed,
+)
+
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+STALE_HEADER = "X-Served-Stale"
+
+
+@dataclass
+class SessionStats:
+    """Counters describing how upstream requests were resolved."""
+
+    requests: int = 0
+    attempts: int = 0
+    retries: int = 0
+    failures: int = 0
+    stale_served: int = 0
+    short_circuited: int = 0
+
+
+class ResilientSession(requests.Session):
+    """
+    requests.Session applying the retry policy, deadline and circuit breaker.
+
+    Successful GET responses made inside allow_stale() are kept in an LRU
+    bounded to stale_cache_bytes of response bodies, and served stale to
+    the same kind of caller while the upstream is failing.
+    """
+
+    def __init__(
+        self,
+        policy: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        stale_cache_bytes: int = 8 * 1024 * 1024
+    ):
+        super().__init__()
+        self.logger = logging.getLogger(__name__)
+        self.policy = policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.stats = SessionStats()
+        self.stale_cache_bytes = stale_cache_bytes
+        self._stale: "OrderedDict[str, Tuple[int, bytes, dict]]" = OrderedDict()
+        self._stale_bytes = 0
+        self._stale_lock = threading.Lock()
+
+    def request(self, method, url, *args, **kwargs) -> requests.Response:
+        self.stats.requests += 1
+        error: Optional[str] = None
+        retry_after: Optional[float] = None
+
+        for attempt in range(self.policy.max_attempts):
+            if not self.breaker.allow_request():
+                self.stats.short_circuited += 1
+                return self._stale_or_raise(method, url, CircuitOpenError(
+                    f"Circuit open for upstream; retry in {self.breaker.retry_after:.0f}s",
+                    retry_after=self.breaker.retry_after
+                ))
+
+            timeout = self.policy.request_timeout
+            remaining = remaining_time()
+            if remaining is not None:
+                if remaining <= 0:
+                    break
+                timeout = min(timeout, remaining)
+            kwargs["timeout"] = timeout
+
+            self.stats.attempts += 1
+            retry_after = None
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except requests.RequestException as e:
+                # Any transport failure, including a body cut off mid-read
+                self.breaker.record_failure()
+                error = f"{type(e).__name__}: {e}"
+            except BaseException:
+                # Still record the attempt, or a half-open probe would stay in flight forever
+                self.breaker.record_failure()
+                raise
+            else:
+                if response.status_code not in RETRYABLE_STATUS:
+                    self.breaker.record_success()
+                    if method.upper() == "GET" and response.status_code == 200 and stale_allowed():
+                        self._remember(url, response)
+                    return response
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                self.breaker.record_failure(retry_after)
+                error = f"HTTP {response.status_code}"
+
+            self.stats.failures += 1
+            if attempt + 1 >= self.policy.max_attempts:
+                break
+            delay = (
+                retry_after if retry_after is not None
+                else self.policy.backoff(attempt, self.breaker.error_rate)
+            )
+            remaining = remaining_time()
+            if delay > self.policy.max_delay or (remaining is not None and delay >= remaining):
+                # Waiting would blow the budget; fail fast instead
+                break
+            self.logger.warning("Upstream %s (attempt %d); retrying in %.1fs", error, attempt + 1, delay)
+            self.stats.retries += 1
+            time.sleep(delay)
+
+        remaining = remaining_time()
+        if remaining is not None and remaining <= 0:
+            failure: UpstreamUnavailableError = DeadlineExceededError(
+                f"Deadline exceeded calling upstream (last error: {error})"
+            )
+        else:
+            failure = UpstreamUnavailableError(
+                f"Upstream unavailable: {error}", retry_after=retry_after
+            )
+        return self._stale_or_raise(method, url, failure)
+
+    def warm(self, url: str, timeout: float = 5.0) -> bool:
+        """
+        Open a pooled connection to url's host ahead of the first real request.
+
+        Sends a HEAD request to the host root, bypassing retries and the
+        circuit breaker so warming never affects upstream health tracking.
+
+        Returns:
+            True if a connection was established
+        """
+        parts = urlsplit(url)
+        try:
+            super().request("HEAD", f"{parts.scheme}://{parts.netloc}/", timeout=timeout)
+        except requests.RequestException as e:
+            self.logger.warning("Could not prewarm connection to %s: %s", parts.netloc, e)
+            return False
+        return True
+
+    def _remember(self, url: str, response: requests.Response) -> None:
+        content = response.content
+        with self._stale_lock:
+            previous = self._stale.pop(url, None)
+            if previous is not None:
+                self._stale_bytes -= len(previous[1])
+            if len(content) > self.stale_cache_bytes:
+                return
+            self._stale[url] = (response.status_code, content, dict(response.headers))
+            self._stale_bytes += len(content)
+            while self._stale_bytes > self.stale_cache_bytes:
+                _, (_, evicted, _) = self._stale.popitem(last=False)
+                self._stale_bytes -= len(evicted)
+
+    def _stale_or_raise(self, method: str, url: str, error: UpstreamUnavailableError) -> requests.Response:
+        if method.upper() != "GET" or not stale_allowed():
+            raise error
+        with self._stale_lock:
+            cached = self._stale.get(url)
+        if cached is None:
+            raise error
+
+        self.logger.warning("Serving stale response for %s: %s", url, error)
+        self.stats.stale_served += 1
+        status, content, headers = cached
+        response = requests.Response()
+        response.status_code = status
+        response._content = content
+        response.headers = CaseInsensitiveDict(headers)
+        response.headers[STALE_HEADER] = "1"
+        response.url = url
+        return response
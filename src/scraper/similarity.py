@@ -0,0 +1,543 @@
+"""Offline "related papers" index over paper titles and abstracts.
+
+Papers are turned into hashed, sublinear TF-IDF vectors. The bulk of the index
+lives in an on-disk segment holding both a forward (paper -> terms) and an
+inverted (term -> papers) sparse matrix, memory-mapped on load so only the
+postings a query touches are paged in. Newly added papers go to a small
+in-memory delta that is merged into the segment by compact(), which add()
+starts in a background thread once the delta grows large.
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import unicodedata
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    # scipy is only needed to build matrices, so it is imported where they are built
+    from scipy import sparse
+
+from .paper_scraper import PaperMetadata, get_paper_id, normalize_paper_id
+
+DEFAULT_N_FEATURES = 2 ** 20
+DEFAULT_MAX_QUERY_TERMS = 32
+DEFAULT_MAX_DOC_FREQ = 0.05
+MIN_PRUNED_DOC_FREQ = 100  # small indexes are cheap to score exhaustively
+DEFAULT_COMPACT_THRESHOLD = 50_000
+QUERY_BATCH_SIZE = 16  # bounds the (batch, n_docs) score matrix
+FORMAT_VERSION = 1
+
+STOP_WORDS = frozenset("""
+    a about above after again all also an and any are as at be been before being
+    below between both but by can could did do does doing down during each few for
+    from further had has have having here how however i if in into is it its itself
+    just more most no nor not now of off on once only or other our out over own same
+    several should so some such than that the their them then there these they this
+    those through thus to too under until up upon very via was we were what when
+    where which while who whom why will with within without would yet
+""".split())
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+RelatedPaper = Tuple[str, float]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, strip diacritics and split text into content words."""
+    text = text.lower()
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return [
+        token for token in _TOKEN_PATTERN.findall(text)
+        if len(token) > 1 and token not in STOP_WORDS
+    ]
+
+
+def hash_features(text: str, n_features: int = DEFAULT_N_FEATURES) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hash text into a sparse sublinear term-frequency vector.
+
+    CRC32 is used instead of hash() so feature ids are stable across processes.
+
+    Returns:
+        Tuple of (sorted feature ids as int32, 1 + log(count) weights as float32)
+    """
+    counts: Counter = Counter()
+    for token, count in Counter(tokenize(text)).items():
+        counts[zlib.crc32(token.encode("ascii")) % n_features] += count
+    terms = np.fromiter(sorted(counts), dtype=np.int32, count=len(counts))
+    tf = 1.0 + np.log(np.fromiter((counts[t] for t in terms), dtype=np.float32, count=len(counts)))
+    return terms, tf.astype(np.float32)
+
+
+def paper_text(paper: PaperMetadata) -> str:
+    """Text indexed for a paper."""
+    return f"{paper.title}\n{paper.abstract}"
+
+
+@dataclass
+class _Segment:
+    """Immutable compacted part of the index; arrays may be memory-mapped."""
+
+    ids: np.ndarray          # (n_docs,) bytes paper ids
+    doc_indptr: np.ndarray   # (n_docs + 1,) forward CSR
+    doc_terms: np.ndarray
+    doc_tf: np.ndarray
+    term_indptr: np.ndarray  # (n_features + 1,) inverted CSR
+    term_docs: np.ndarray
+    term_tf: np.ndarray
+    idf: np.ndarray          # (n_features,) idf frozen at compaction time
+    norms: np.ndarray        # (n_docs,) L2 norm of each tf-idf vector
+
+    ARRAYS = (
+        "ids", "doc_indptr", "doc_terms", "doc_tf",
+        "term_indptr", "term_docs", "term_tf", "idf", "norms",
+    )
+
+    @classmethod
+    def empty(cls, n_features: int) -> "_Segment":
+        return cls(
+            ids=np.array([], dtype="S1"),
+            doc_indptr=np.zeros(1, dtype=np.int64),
+            doc_terms=np.array([], dtype=np.int32),
+            doc_tf=np.array([], dtype=np.float32),
+            term_indptr=np.zeros(n_features + 1, dtype=np.int64),
+            term_docs=np.array([], dtype=np.int32),
+            term_tf=np.array([], dtype=np.float32),
+            idf=np.ones(n_features, dtype=np.float32),
+            norms=np.array([], dtype=np.float32),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def forward_matrix(self, n_features: int) -> "sparse.csr_matrix":
+        from scipy import sparse
+
+        return sparse.csr_matrix(
+            (self.doc_tf, self.doc_terms, self.doc_indptr),
+            shape=(len(self), n_features)
+        )
+
+    def vector(self, position: int) -> Tuple[np.ndarray, np.ndarray]:
+        start, end = self.doc_indptr[position], self.doc_indptr[position + 1]
+        return np.asarray(self.doc_terms[start:end]), np.asarray(self.doc_tf[start:end])
+
+
+class SimilarityIndex:
+    """
+    Nearest-neighbour index answering "papers similar to this one" offline.
+
+    Similarity is the cosine between hashed TF-IDF vectors. As in "more like
+    this" search engines, queries drop terms found in more than max_doc_freq of
+    all papers and keep their max_query_terms highest-weighted remaining terms;
+    scores are then computed by gathering only those terms' posting lists from
+    the inverted matrix, so query cost depends on the length of rare posting
+    lists rather than on the total number of papers. Dropped terms still count
+    towards vector norms, so scores slightly underestimate the exact cosine.
+
+    IDF weights are refreshed when the delta is compacted into the on-disk
+    segment; until then new papers are weighted with the previous IDF.
+    Additions are durable only after compact() (or save()) when a path is set,
+    so long-running processes should call save() on shutdown.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        n_features: int = DEFAULT_N_FEATURES,
+        max_query_terms: int = DEFAULT_MAX_QUERY_TERMS,
+        max_doc_freq: float = DEFAULT_MAX_DOC_FREQ,
+        compact_threshold: int = DEFAULT_COMPACT_THRESHOLD
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path) if path is not None else None
+        self.n_features = n_features
+        self.max_query_terms = max_query_terms
+        self.max_doc_freq = max_doc_freq
+        self.compact_threshold = compact_threshold
+
+        self._lock = threading.RLock()
+        self._segment = _Segment.empty(n_features)
+        self._positions: Optional[dict] = None
+        self._delta_ids: List[str] = []
+        self._delta_vectors: List[Tuple[np.ndarray, np.ndarray]] = []
+        self._delta_norms: List[float] = []
+        self._delta_matrix: Optional["sparse.csr_matrix"] = None
+        self._compact_lock = threading.Lock()
+        self._compaction_thread: Optional[threading.Thread] = None
+
+        if self.path is not None and (self.path / "meta.json").exists():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._segment) + len(self._delta_ids)
+
+    def __contains__(self, paper_id: str) -> bool:
+        return normalize_paper_id(paper_id) in self._get_positions()
+
+    def add(self, papers: Iterable[PaperMetadata]) -> int:
+        """
+        Add papers to the index, skipping ones already present.
+
+        Once the delta reaches compact_threshold papers or outgrows the
+        compacted segment, compaction is started in a background thread, so
+        callers on the search path never wait for it.
+
+        Returns:
+            Number of papers added
+        """
+        added = 0
+        with self._lock:
+            positions = self._get_positions()
+            for paper in papers:
+                paper_id = get_paper_id(paper)
+                if paper_id in positions:
+                    continue
+                terms, tf = hash_features(paper_text(paper), self.n_features)
+                positions[paper_id] = len(self)
+                self._delta_ids.append(paper_id)
+                self._delta_vectors.append((terms, tf))
+                self._delta_norms.append(self._norm(terms, tf, self._segment.idf))
+                added += 1
+
+            if added:
+                self._delta_matrix = None
+                delta_size = len(self._delta_ids)
+                if delta_size >= self.compact_threshold or delta_size > len(self._segment):
+                    self._start_compaction()
+        return added
+
+    def related(self, paper_id: str, k: int = 10) -> List[RelatedPaper]:
+        """
+        Find the k papers most similar to an indexed paper.
+
+        Returns:
+            List of (paper_id, score) pairs, best first; empty if the paper is unknown
+        """
+        paper_id = normalize_paper_id(paper_id)
+        with self._lock:
+            position = self._get_positions().get(paper_id)
+            if position is None:
+                return []
+            segment_size = len(self._segment)
+            if position < segment_size:
+                terms, tf = self._segment.vector(position)
+            else:
+                terms, tf = self._delta_vectors[position - segment_size]
+        return self._search([(terms, tf)], k, exclude=[position])[0]
+
+    def query(self, text: str, k: int = 10) -> List[RelatedPaper]:
+        """Find the k indexed papers most similar to free text."""
+        return self.query_many([text], k)[0]
+
+    def query_many(self, texts: Sequence[str], k: int = 10) -> List[List[RelatedPaper]]:
+        """Score a batch of free-text queries together."""
+        vectors = [hash_features(text, self.n_features) for text in texts]
+        return self._search(vectors, k, exclude=[None] * len(vectors))
+
+    def warm(self) -> None:
+        """Build the paper ID lookup and page in per-term weights ahead of the first query."""
+        with self._lock:
+            self._get_positions()
+            # Every query reads idf and norms; touching them faults the pages in
+            float(self._segment.idf.sum() + self._segment.norms.sum())
+
+    def compact(self) -> None:
+        """
+        Merge the in-memory delta into the segment, refresh IDF and persist.
+
+        The merged segment is built and written without holding the index
+        lock, so queries and additions carry on meanwhile; papers added while
+        compacting stay in the delta for the next compaction.
+        """
+        from scipy import sparse
+
+        with self._compact_lock:
+            with self._lock:
+                if not self._delta_ids:
+                    return
+                segment = self._segment
+                delta_ids = list(self._delta_ids)
+                delta_matrix = self._build_delta_matrix()
+
+            merged = sparse.vstack(
+                [segment.forward_matrix(self.n_features), delta_matrix],
+                format="csr"
+            )
+            merged.sort_indices()
+            inverted = merged.T.tocsr()
+            inverted.sort_indices()
+
+            n_docs = merged.shape[0]
+            df = np.diff(inverted.indptr)
+            idf = (np.log((1.0 + n_docs) / (1.0 + df)) + 1.0).astype(np.float32)
+            norms = np.sqrt(merged.multiply(merged) @ (idf.astype(np.float64) ** 2))
+
+            ids = np.concatenate([
+                np.asarray(segment.ids),
+                np.array([paper_id.encode("utf-8") for paper_id in delta_ids]),
+            ])
+            new_segment = _Segment(
+                ids=ids,
+                doc_indptr=merged.indptr.astype(np.int64),
+                doc_terms=merged.indices.astype(np.int32),
+                doc_tf=merged.data.astype(np.float32),
+                term_indptr=inverted.indptr.astype(np.int64),
+                term_docs=inverted.indices.astype(np.int32),
+                term_tf=inverted.data.astype(np.float32),
+                idf=idf,
+                norms=norms.astype(np.float32),
+            )
+
+            if self.path is not None:
+                self._write(new_segment)
+                new_segment = self._read()
+
+            with self._lock:
+                # Positions are unchanged: merged papers keep their order and
+                # later additions still follow them
+                merged_count = len(delta_ids)
+                self._segment = new_segment
+                self._delta_ids = self._delta_ids[merged_count:]
+                self._delta_vectors = self._delta_vectors[merged_count:]
+                self._delta_norms = [
+                    self._norm(terms, tf, new_segment.idf) for terms, tf in self._delta_vectors
+                ]
+                self._delta_matrix = None
+            self.logger.info("Compacted similarity index to %d papers", n_docs)
+
+    def save(self) -> None:
+        """Persist all papers added so far."""
+        self.compact()
+
+    def _start_compaction(self) -> None:
+        """Compact in a daemon thread unless a compaction is already running"""
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return
+        self._compaction_thread = threading.Thread(
+            target=self._compact_in_background, name="similarity-compact", daemon=True
+        )
+        self._compaction_thread.start()
+
+    def _compact_in_background(self) -> None:
+        try:
+            self.compact()
+        except Exception as e:
+            self.logger.error("Error compacting similarity index: %s", e)
+
+    def _search(
+        self,
+        vectors: List[Tuple[np.ndarray, np.ndarray]],
+        k: int,
+        exclude: List[Optional[int]]
+    ) -> List[List[RelatedPaper]]:
+        with self._lock:
+            segment = self._segment
+            delta_matrix = self._build_delta_matrix()
+            delta_norms = np.array(self._delta_norms, dtype=np.float64)
+            delta_ids = list(self._delta_ids)
+
+        queries = [self._prune_query(terms, tf, segment) for terms, tf in vectors]
+        results = []
+        for start in range(0, len(queries), QUERY_BATCH_SIZE):
+            batch = queries[start:start + QUERY_BATCH_SIZE]
+            scores = np.hstack([
+                self._score_segment(segment, batch),
+                self._score_delta(delta_matrix, delta_norms, batch),
+            ])
+            for row, position in zip(scores, exclude[start:start + QUERY_BATCH_SIZE]):
+                if position is not None:
+                    row[position] = 0.0
+                results.append(self._top_k(row, k, segment, delta_ids))
+        return results
+
+    def _prune_query(
+        self,
+        terms: np.ndarray,
+        tf: np.ndarray,
+        segment: _Segment
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Keep the rarest, highest-weighted terms and fold query norm and IDF into the weights."""
+        idf = segment.idf
+        weights = tf * idf[terms]
+        norm = np.linalg.norm(weights)
+        if norm == 0:
+            return terms, weights
+
+        if len(segment):
+            df = segment.term_indptr[terms + 1] - segment.term_indptr[terms]
+            rare = df <= max(MIN_PRUNED_DOC_FREQ, self.max_doc_freq * len(segment))
+            if rare.any():
+                terms, weights = terms[rare], weights[rare]
+        if len(terms) > self.max_query_terms:
+            keep = np.argpartition(-weights, self.max_query_terms)[:self.max_query_terms]
+            terms, weights = terms[keep], weights[keep]
+        return terms, (weights / norm) * idf[terms]
+
+    @staticmethod
+    def _score_segment(
+        segment: _Segment,
+        queries: List[Tuple[np.ndarray, np.ndarray]]
+    ) -> np.ndarray:
+        """
+        Score all segment papers for a batch of queries with one gather and bincount.
+
+        Posting slices for every query term are concatenated into one index
+        array, so the memory-mapped postings are read with a single fancy-index
+        and accumulated into a (n_queries, n_docs) matrix without Python loops
+        over papers.
+        """
+        n_docs = len(segment)
+        scores = np.zeros((len(queries), n_docs))
+        if n_docs == 0:
+            return scores
+
+        starts, lengths, weights, rows = [], [], [], []
+        for row, (terms, query_weights) in enumerate(queries):
+            term_starts = segment.term_indptr[terms]
+            starts.append(term_starts)
+            lengths.append(segment.term_indptr[terms + 1] - term_starts)
+            weights.append(query_weights)
+            rows.append(np.full(len(terms), row, dtype=np.int64))
+        starts = np.concatenate(starts)
+        lengths = np.concatenate(lengths)
+        total = int(lengths.sum())
+        if total == 0:
+            return scores
+
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        postings = offsets + np.arange(total)
+        docs = np.asarray(segment.term_docs[postings], dtype=np.int64)
+        contributions = np.asarray(segment.term_tf[postings]) * np.repeat(
+            np.concatenate(weights), lengths
+        )
+        flat = np.repeat(np.concatenate(rows), lengths) * n_docs + docs
+        scores += np.bincount(
+            flat, weights=contributions, minlength=len(queries) * n_docs
+        ).reshape(len(queries), n_docs)
+        norms = np.asarray(segment.norms, dtype=np.float64)
+        np.divide(scores, norms, out=scores, where=norms > 0)
+        return scores
+
+    def _score_delta(
+        self,
+        delta_matrix: "sparse.csr_matrix",
+        delta_norms: np.ndarray,
+        queries: List[Tuple[np.ndarray, np.ndarray]]
+    ) -> np.ndarray:
+        from scipy import sparse
+
+        if delta_matrix.shape[0] == 0:
+            return np.zeros((len(queries), 0))
+        query_matrix = sparse.csr_matrix(
+            (
+                np.concatenate([weights for _, weights in queries]),
+                np.concatenate([terms for terms, _ in queries]),
+                np.concatenate([[0], np.cumsum([len(terms) for terms, _ in queries])]),
+            ),
+            shape=(len(queries), self.n_features)
+        )
+        scores = (query_matrix @ delta_matrix.T).toarray()
+        np.divide(scores, delta_norms, out=scores, where=delta_norms > 0)
+        return scores
+
+    @staticmethod
+    def _top_k(
+        scores: np.ndarray,
+        k: int,
+        segment: _Segment,
+        delta_ids: List[str]
+    ) -> List[RelatedPaper]:
+        k = min(k, int(np.count_nonzero(scores > 0)))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        segment_size = len(segment)
+        return [
+            (
+                segment.ids[position].decode("utf-8") if position < segment_size
+                else delta_ids[position - segment_size],
+                float(scores[position]),
+            )
+            for position in top
+        ]
+
+    @staticmethod
+    def _norm(terms: np.ndarray, tf: np.ndarray, idf: np.ndarray) -> float:
+        return float(np.linalg.norm(tf * idf[terms]))
+
+    def _build_delta_matrix(self) -> "sparse.csr_matrix":
+        from scipy import sparse
+
+        if self._delta_matrix is None:
+            lengths = [len(terms) for terms, _ in self._delta_vectors]
+            self._delta_matrix = sparse.csr_matrix(
+                (
+                    np.concatenate([tf for _, tf in self._delta_vectors] or [np.array([], np.float32)]),
+                    np.concatenate([terms for terms, _ in self._delta_vectors] or [np.array([], np.int32)]),
+                    np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]),
+                ),
+                shape=(len(self._delta_vectors), self.n_features)
+            )
+        return self._delta_matrix
+
+    def _get_positions(self) -> dict:
+        if self._positions is None:
+            positions = {
+                paper_id.decode("utf-8"): position
+                for position, paper_id in enumerate(self._segment.ids.tolist())
+            }
+            offset = len(self._segment)
+            positions.update(
+                (paper_id, offset + i) for i, paper_id in enumerate(self._delta_ids)
+            )
+            self._positions = positions
+        return self._positions
+
+    def _write(self, segment: _Segment) -> None:
+        """Write a segment to a temporary directory and swap it in."""
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        if tmp_path.exists():
+            shutil.rmtree(tmp_path)
+        tmp_path.mkdir(parents=True)
+        for name in _Segment.ARRAYS:
+            np.save(tmp_path / f"{name}.npy", getattr(segment, name))
+        meta = {"version": FORMAT_VERSION, "n_features": self.n_features, "n_docs": len(segment)}
+        (tmp_path / "meta.json").write_text(json.dumps(meta))
+
+        old_path = self.path.with_name(self.path.name + ".old")
+        if self.path.exists():
+            os.replace(self.path, old_path)
+        os.replace(tmp_path, self.path)
+        if old_path.exists():
+            shutil.rmtree(old_path)
+
+    def _read(self) -> _Segment:
+        arrays = {}
+        for name in _Segment.ARRAYS:
+            array_path = self.path / f"{name}.npy"
+            try:
+                arrays[name] = np.load(array_path, mmap_mode="r")
+            except ValueError:
+                # Zero-length arrays cannot be memory-mapped
+                arrays[name] = np.load(array_path)
+        return _Segment(**arrays)
+
+    def _load(self) -> None:
+        meta = json.loads((self.path / "meta.json").read_text())
+        if meta["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported similarity index version {meta['version']}")
+        self.n_features = meta["n_features"]
+        self._segment = self._read()
@@ -0,0 +1,445 @@
+"""Compressed, memory-mapped on-disk store of paper records.
+
+Papers are serialized to a compact binary record (length-prefixed strings,
+ArXiv URL prefixes replaced by a one-byte code), grouped into blocks and
+each block is compressed with zstd using a dictionary trained on the first
+records written. Abstracts dominate the records, so the dictionary mostly
+captures their shared vocabulary, which is what lets small blocks compress
+well. A sorted ID index maps each paper to its block and slot; the index,
+the block offsets and the block file are memory-mapped, so a lookup only
+pages in the index entries a binary search touches and one block.
+"""
+
+import json
+import logging
+import mmap
+import os
+import shutil
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .paper_scraper import PaperMetadata, get_paper_id, normalize_paper_id
+
+DEFAULT_BLOCK_SIZE = 16
+DEFAULT_DICTIONARY_SIZE = 112 * 1024  # zstd's default dictionary size
+DEFAULT_TRAINING_SAMPLES = 20_000
+MIN_TRAINING_SAMPLES = 256  # below this a dictionary does more harm than good
+DEFAULT_COMPRESSION_LEVEL = 9
+DEFAULT_CACHED_BLOCKS = 64
+FORMAT_VERSION = 1
+
+# Index 0 means "no prefix"; order must never change once stores exist
+URL_PREFIXES = (
+    "",
+    "http://arxiv.org/abs/",
+    "http://arxiv.org/pdf/",
+    "https://arxiv.org/abs/",
+    "https://arxiv.org/pdf/",
+)
+
+_HAS_DOI = 1
+_HAS_URL = 2
+_HAS_PDF_URL = 4
+_HAS_CITATIONS = 8
+
+
+def _require_zstandard():
+    """Import zstandard on demand so the rest of the package works without it."""
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("zstandard is required for the paper store: pip install zstandard") from e
+    return zstandard
+
+
+def _write_varint(buffer: bytearray, value: int) -> None:
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data: bytes, position: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def _write_str(buffer: bytearray, text: str) -> None:
+    encoded = text.encode("utf-8")
+    _write_varint(buffer, len(encoded))
+    buffer += encoded
+
+
+def _read_str(data: bytes, position: int) -> Tuple[str, int]:
+    length, position = _read_varint(data, position)
+    end = position + length
+    return data[position:end].decode("utf-8"), end
+
+
+def _write_url(buffer: bytearray, url: str) -> None:
+    code = 0
+    for candidate in range(1, len(URL_PREFIXES)):
+        if url.startswith(URL_PREFIXES[candidate]):
+            code = candidate
+            break
+    buffer.append(code)
+    _write_str(buffer, url[len(URL_PREFIXES[code]):])
+
+
+def _read_url(data: bytes, position: int) -> Tuple[str, int]:
+    code = data[position]
+    rest, position = _read_str(data, position + 1)
+    return URL_PREFIXES[code] + rest, position
+
+
+def encode_paper(paper: PaperMetadata) -> bytes:
+    """Serialize a paper into the store's binary record format."""
+    flags = (
+        (_HAS_DOI if paper.doi is not None else 0)
+        | (_HAS_URL if paper.url is not None else 0)
+        | (_HAS_PDF_URL if paper.pdf_url is not None else 0)
+        | (_HAS_CITATIONS if paper.citations is not None else 0)
+    )
+    buffer = bytearray([flags])
+    _write_str(buffer, paper.title)
+    _write_str(buffer, paper.abstract)
+    _write_str(buffer, paper.publication_date)
+    _write_varint(buffer, len(paper.authors))
+    for author in paper.authors:
+        _write_str(buffer, author)
+    if paper.doi is not None:
+        _write_str(buffer, paper.doi)
+    if paper.url is not None:
+        _write_url(buffer, paper.url)
+    if paper.pdf_url is not None:
+        _write_url(buffer, paper.pdf_url)
+    if paper.citations is not None:
+        _write_varint(buffer, paper.citations)
+    return bytes(buffer)
+
+
+def decode_paper(data: bytes, position: int = 0) -> PaperMetadata:
+    """Deserialize a record written by encode_paper."""
+    flags = data[position]
+    title, position = _read_str(data, position + 1)
+    abstract, position = _read_str(data, position)
+    publication_date, position = _read_str(data, position)
+    n_authors, position = _read_varint(data, position)
+    authors = []
+    for _ in range(n_authors):
+        author, position = _read_str(data, position)
+        authors.append(author)
+    doi = url = pdf_url = citations = None
+    if flags & _HAS_DOI:
+        doi, position = _read_str(data, position)
+    if flags & _HAS_URL:
+        url, position = _read_url(data, position)
+    if flags & _HAS_PDF_URL:
+        pdf_url, position = _read_url(data, position)
+    if flags & _HAS_CITATIONS:
+        citations, position = _read_varint(data, position)
+    return PaperMetadata(
+        title=title,
+        authors=authors,
+        abstract=abstract,
+        publication_date=publication_date,
+        doi=doi,
+        url=url,
+        citations=citations,
+        pdf_url=pdf_url,
+    )
+
+
+class _StoreWriter:
+    """Streams records into blocks, training the dictionary from the first ones."""
+
+    def __init__(self, path: Path, block_size: int, dictionary_size: int, training_samples: int, level: int):
+        self.zstd = _require_zstandard()
+        self.path = path
+        self.block_size = block_size
+        self.dictionary_size = dictionary_size
+        self.training_samples = training_samples
+        self.level = level
+
+        self.blocks_file = open(path / "blocks.bin", "wb")
+        self.block_offsets = array("Q", [0])
+        self.ids: List[bytes] = []
+        self.locations = array("I")
+        self.seen = set()
+        self.pending: List[bytes] = []
+        self.compressor = None
+        self.dictionary = b""
+        self.json_bytes = 0
+        self.record_bytes = 0
+
+    def add(self, paper: PaperMetadata) -> bool:
+        paper_id = get_paper_id(paper).encode("utf-8")
+        if paper_id in self.seen:
+            return False
+        self.seen.add(paper_id)
+        record = encode_paper(paper)
+        self.ids.append(paper_id)
+        self.json_bytes += len(json.dumps(vars(paper), ensure_ascii=False).encode("utf-8")) + 1
+        self.record_bytes += len(record)
+        self.pending.append(record)
+        if self.compressor is None:
+            if len(self.pending) >= self.training_samples:
+                self._start_compressing()
+        elif len(self.pending) >= self.block_size:
+            self._flush_block(self.pending)
+            self.pending = []
+        return True
+
+    def finish(self) -> dict:
+        if self.compressor is None:
+            self._start_compressing()
+        if self.pending:
+            self._flush_block(self.pending)
+        self.blocks_file.close()
+
+        ids = np.array(self.ids, dtype=f"S{max((len(i) for i in self.ids), default=1)}")
+        order = np.argsort(ids, kind="stable")
+        np.save(self.path / "ids.npy", ids[order])
+        np.save(self.path / "locations.npy", np.asarray(self.locations, dtype=np.uint32)[order])
+        np.save(self.path / "block_offsets.npy", np.asarray(self.block_offsets, dtype=np.uint64))
+        (self.path / "dictionary.bin").write_bytes(self.dictionary)
+        return {
+            "version": FORMAT_VERSION,
+            "block_size": self.block_size,
+            "n_papers": len(self.ids),
+            "n_blocks": len(self.block_offsets) - 1,
+            "json_bytes": self.json_bytes,
+            "record_bytes": self.record_bytes,
+            "block_bytes": int(self.block_offsets[-1]),
+            "dictionary_bytes": len(self.dictionary),
+        }
+
+    def _start_compressing(self) -> None:
+        """Train the dictionary on the buffered records, then flush them as blocks."""
+        if len(self.pending) >= MIN_TRAINING_SAMPLES:
+            try:
+                trained = self.zstd.train_dictionary(self.dictionary_size, self.pending)
+                self.dictionary = trained.as_bytes()
+            except self.zstd.ZstdError as e:
+                logging.getLogger(__name__).warning(f"Compressing without a dictionary: {str(e)}")
+        dictionary = self.zstd.ZstdCompressionDict(self.dictionary) if self.dictionary else None
+        self.compressor = self.zstd.ZstdCompressor(level=self.level, dict_data=dictionary)
+        pending, self.pending = self.pending, []
+        for start in range(0, len(pending), self.block_size):
+            self._flush_block(pending[start:start + self.block_size])
+
+    def _flush_block(self, records: List[bytes]) -> None:
+        block_number = len(self.block_offsets) - 1
+        if block_number >= 1 << 24:
+            raise ValueError("Paper store is limited to 2**24 blocks; increase block_size")
+        header = bytearray()
+        _write_varint(header, len(records))
+        for record in records:
+            _write_varint(header, len(record))
+        compressed = self.compressor.compress(bytes(header) + b"".join(records))
+        self.blocks_file.write(compressed)
+        self.block_offsets.append(self.block_offsets[-1] + len(compressed))
+        self.locations.extend((block_number << 8) | slot for slot in range(len(records)))
+
+
+class PaperStore:
+    """
+    Read-only compressed store of PaperMetadata keyed by versionless paper ID.
+
+    Build one with PaperStore.write() from any iterable of papers (e.g.
+    ArxivScraper.iter_papers), then open it with PaperStore(path). Writing
+    streams: only the dictionary training sample, the current block and the
+    ID index are held in memory. A store is immutable; write a new one to
+    add papers. Each location packs the block number and the slot within the
+    block into one uint32 (24 + 8 bits), so block_size is at most 256.
+    Recently decompressed blocks are kept in a small LRU cache.
+    """
+
+    def __init__(self, path: Union[str, Path], cached_blocks: int = DEFAULT_CACHED_BLOCKS):
+        zstd = _require_zstandard()
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path)
+        self.meta = json.loads((self.path / "meta.json").read_text())
+        if self.meta["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported paper store version {self.meta['version']}")
+        self.cached_blocks = cached_blocks
+
+        self._ids = self._load_array("ids")
+        self._locations = self._load_array("locations")
+        self._block_offsets = self._load_array("block_offsets")
+        self._blocks_file = open(self.path / "blocks.bin", "rb")
+        self._blocks = (
+            mmap.mmap(self._blocks_file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self.meta["block_bytes"] else b""
+        )
+
+        dictionary = (self.path / "dictionary.bin").read_bytes()
+        self._decompressor = zstd.ZstdDecompressor(
+            dict_data=zstd.ZstdCompressionDict(dictionary) if dictionary else None
+        )
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[int, Tuple[bytes, List[int]]]" = OrderedDict()
+
+    @classmethod
+    def write(
+        cls,
+        path: Union[str, Path],
+        papers: Iterable[PaperMetadata],
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        dictionary_size: int = DEFAULT_DICTIONARY_SIZE,
+        training_samples: int = DEFAULT_TRAINING_SAMPLES,
+        level: int = DEFAULT_COMPRESSION_LEVEL
+    ) -> "PaperStore":
+        """
+        Write papers to a new store at path, replacing any existing one.
+
+        Papers whose ID was already written are skipped.
+
+        Args:
+            path: Store directory
+            papers: Papers to store
+            block_size: Records per compressed block; larger compresses better,
+                smaller makes random reads cheaper (1-256)
+            dictionary_size: Maximum size of the trained dictionary in bytes
+            training_samples: Number of leading records the dictionary is trained on
+            level: zstd compression level
+
+        Returns:
+            The new store, opened for reading
+        """
+        if not 1 <= block_size <= 256:
+            raise ValueError("block_size must be between 1 and 256")
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        if tmp_path.exists():
+            shutil.rmtree(tmp_path)
+        tmp_path.mkdir(parents=True)
+
+        writer = _StoreWriter(tmp_path, block_size, dictionary_size, training_samples, level)
+        try:
+            for paper in papers:
+                writer.add(paper)
+            meta = writer.finish()
+        finally:
+            writer.blocks_file.close()
+        (tmp_path / "meta.json").write_text(json.dumps(meta))
+
+        old_path = path.with_name(path.name + ".old")
+        if path.exists():
+            os.replace(path, old_path)
+        os.replace(tmp_path, path)
+        if old_path.exists():
+            shutil.rmtree(old_path)
+        return cls(path)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, paper_id: str) -> bool:
+        return self._find(paper_id) is not None
+
+    def __iter__(self) -> Iterator[PaperMetadata]:
+        """Yield every paper in write order."""
+        for block_number in range(len(self._block_offsets) - 1):
+            data, offsets = self._read_block(block_number, cache=False)
+            for offset in offsets[:-1]:
+                yield decode_paper(data, offset)
+
+    def __enter__(self) -> "PaperStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def compression_ratio(self) -> float:
+        """Size of the papers as JSON lines divided by the size of the store."""
+        stored = self.meta["block_bytes"] + self.meta["dictionary_bytes"] + self.index_bytes
+        return self.meta["json_bytes"] / stored if stored else 0.0
+
+    @property
+    def index_bytes(self) -> int:
+        return self._ids.nbytes + self._locations.nbytes + self._block_offsets.nbytes
+
+    def get(self, paper_id: str) -> Optional[PaperMetadata]:
+        """Return the stored paper with this ID (any version suffix is ignored), or None."""
+        location = self._find(paper_id)
+        if location is None:
+            return None
+        data, offsets = self._read_block(location >> 8)
+        return decode_paper(data, offsets[location & 0xFF])
+
+    def get_many(self, paper_ids: Sequence[str]) -> List[Optional[PaperMetadata]]:
+        """Look up several papers, decompressing each block they share only once."""
+        by_block: Dict[int, List[Tuple[int, int]]] = {}
+        for position, paper_id in enumerate(paper_ids):
+            location = self._find(paper_id)
+            if location is not None:
+                by_block.setdefault(location >> 8, []).append((position, location & 0xFF))
+
+        papers: List[Optional[PaperMetadata]] = [None] * len(paper_ids)
+        for block_number in sorted(by_block):
+            data, offsets = self._read_block(block_number)
+            for position, slot in by_block[block_number]:
+                papers[position] = decode_paper(data, offsets[slot])
+        return papers
+
+    def close(self) -> None:
+        if isinstance(self._blocks, mmap.mmap):
+            self._blocks.close()
+        self._blocks_file.close()
+
+    def _find(self, paper_id: str) -> Optional[int]:
+        key = normalize_paper_id(paper_id).encode("utf-8")
+        if not len(self._ids) or len(key) > self._ids.dtype.itemsize:
+            return None
+        position = int(np.searchsorted(self._ids, key))
+        if position == len(self._ids) or self._ids[position] != key:
+            return None
+        return int(self._locations[position])
+
+    def _read_block(self, block_number: int, cache: bool = True) -> Tuple[bytes, List[int]]:
+        """Decompress a block; returns its data and the start offset of every record."""
+        with self._lock:
+            cached = self._cache.get(block_number)
+            if cached is not None:
+                self._cache.move_to_end(block_number)
+                return cached
+
+            start = int(self._block_offsets[block_number])
+            end = int(self._block_offsets[block_number + 1])
+            data = self._decompressor.decompress(self._blocks[start:end])
+
+            count, position = _read_varint(data, 0)
+            lengths = []
+            for _ in range(count):
+                length, position = _read_varint(data, position)
+                lengths.append(length)
+            offsets = [position]
+            for length in lengths:
+                offsets.append(offsets[-1] + length)
+
+            if cache and self.cached_blocks:
+                self._cache[block_number] = (data, offsets)
+                while len(self._cache) > self.cached_blocks:
+                    self._cache.popitem(last=False)
+            return data, offsets
+
+    def _load_array(self, name: str) -> np.ndarray:
+        array_path = self.path / f"{name}.npy"
+        try:
+            return np.load(array_path, mmap_mode="r")
+        except ValueError:
+            # Zero-length arrays cannot be memory-mapped
+            return np.load(array_path)
@@ -0,0 +1,397 @@
+"""Saved-query subscriptions with incremental polling and delta delivery.
+
+Each subscription stores a cursor: the (publication date, paper ID) of the
+newest paper already delivered. Papers reach the API days after their
+submission date, so a poll asks ArXiv for matching papers newest first back
+to ANNOUNCEMENT_LAG_DAYS before the cursor's date, and skips the ones the
+subscription has already delivered. Subscriptions with the same normalized
+query and date range are polled with one shared upstream request.
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import threading
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Literal, Optional, Tuple, Union
+
+from .arxiv_scraper import ArxivScraper
+from .authors import ANNOUNCEMENT_LAG_DAYS
+from .paper_scraper import PaperMetadata, get_paper_id
+
+DeliveryKind = Literal["inbox", "file", "webhook"]
+
+DEFAULT_INTERVAL_MINUTES = 24 * 60
+WEBHOOK_TIMEOUT_SECONDS = 10
+_QUERY_SYNTAX = re.compile(r'["():]|\b(?:AND|OR|ANDNOT)\b')
+
+
+def query_key(query: str) -> str:
+    """
+    Normalize a query so equivalent subscriptions can share one upstream request.
+
+    Plain keyword queries are case- and order-insensitive ('Quantum  computing'
+    and 'computing quantum' match); queries using fields, quotes or boolean
+    operators only match after whitespace is collapsed.
+    """
+    if _QUERY_SYNTAX.search(query):
+        return " ".join(query.split())
+    return " ".join(sorted(query.lower().split()))
+
+
+@dataclass
+class Subscription:
+    """A saved search whose new results are delivered on a schedule."""
+
+    query: str
+    max_results: int = 50
+    date_range: Optional[Dict[str, str]] = None
+    delivery: DeliveryKind = "inbox"
+    target: Optional[str] = None  # file path or webhook URL
+    interval_minutes: int = DEFAULT_INTERVAL_MINUTES
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    cursor: Optional[Tuple[str, str]] = None  # (publication_date, paper_id)
+    # Papers delivered within the lookback window, paper_id -> publication_date
+    delivered: Dict[str, str] = field(default_factory=dict)
+    # Oldest paper of a first poll cut off at max_results; older ones predate the subscription
+    floor: Optional[Tuple[str, str]] = None
+    next_poll_at: Optional[str] = None
+
+    @property
+    def group_key(self) -> Tuple[str, str]:
+        date_range = self.date_range or {}
+        return query_key(self.query), f"{date_range.get('start_date')}..{date_range.get('end_date')}"
+
+
+@dataclass
+class PollStats:
+    """Upstream traffic of incremental polling versus naively re-running every query."""
+
+    polls: int = 0
+    upstream_requests: int = 0
+    naive_requests: int = 0
+    entries_fetched: int = 0  # feed entries downloaded, counting whole pages
+    naive_entries: int = 0
+    papers_delivered: int = 0
+
+    @property
+    def requests_saved(self) -> int:
+        return self.naive_requests - self.upstream_requests
+
+
+def _cursor_of(paper: PaperMetadata) -> Tuple[str, str]:
+    return paper.publication_date, get_paper_id(paper)
+
+
+def _lookback_start(cursor: Tuple[str, str]) -> str:
+    """Oldest publication date a poll after this cursor can still find new papers for."""
+    return (date.fromisoformat(cursor[0]) - timedelta(days=ANNOUNCEMENT_LAG_DAYS)).isoformat()
+
+
+def _is_new(subscription: Subscription, paper: PaperMetadata) -> bool:
+    position = _cursor_of(paper)
+    if position[1] in subscription.delivered:
+        return False
+    return subscription.floor is None or position > tuple(subscription.floor)
+
+
+class SubscriptionManager:
+    """
+    Register, persist and poll saved-query subscriptions.
+
+    New papers are delivered to a JSONL inbox under the state directory, to
+    a JSONL file, or POSTed to a webhook. The first poll delivers the newest
+    max_results papers; later polls page back through the lookback window
+    and deliver every paper not delivered before, so neither a burst of new
+    papers nor a late announcement is cut off. A subscription's cursor and
+    delivered set only change after its delivery succeeds, so failed
+    deliveries are retried on the next poll.
+    """
+
+    def __init__(self, path: Union[str, Path], scraper: Optional[ArxivScraper] = None):
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path)
+        self.scraper = scraper or ArxivScraper()
+        self.subscriptions: Dict[str, Subscription] = {}
+        self.stats = PollStats()
+        self._lock = threading.RLock()
+
+        state_file = self.path / "subscriptions.json"
+        if state_file.exists():
+            state = json.loads(state_file.read_text(encoding="utf-8"))
+            for record in state["subscriptions"]:
+                for key in ("cursor", "floor"):
+                    if record.get(key) is not None:
+                        record[key] = tuple(record[key])
+                subscription = Subscription(**record)
+                self.subscriptions[subscription.id] = subscription
+            self.stats = PollStats(**state["stats"])
+
+    def register(
+        self,
+        query: str,
+        max_results: int = 50,
+        date_range: Optional[Dict[str, str]] = None,
+        delivery: DeliveryKind = "inbox",
+        target: Optional[str] = None,
+        interval_minutes: int = DEFAULT_INTERVAL_MINUTES
+    ) -> Subscription:
+        """
+        Register a saved query, taking the same query parameters as search_papers.
+
+        Args:
+            query: Search query string
+            max_results: Number of most recent papers delivered by the first poll
+            date_range: Optional dict with 'start_date' and 'end_date' in YYYY-MM-DD format
+            delivery: "inbox", "file" or "webhook"
+            target: Output path for "file" or URL for "webhook"
+            interval_minutes: Minimum time between polls
+
+        Returns:
+            The new Subscription
+        """
+        if delivery not in ("inbox", "file", "webhook"):
+            raise ValueError(f"Unknown delivery {delivery!r}")
+        if delivery != "inbox" and not target:
+            raise ValueError(f"Delivery {delivery!r} requires a target")
+        if max_results < 1:
+            raise ValueError("max_results must be at least 1")
+
+        subscription = Subscription(
+            query=query,
+            max_results=max_results,
+            date_range=date_range,
+            delivery=delivery,
+            target=target,
+            interval_minutes=interval_minutes,
+        )
+        with self._lock:
+            self.subscriptions[subscription.id] = subscription
+            self.save()
+        return subscription
+
+    def remove(self, subscription_id: str) -> bool:
+        """Delete a subscription; returns False if it does not exist."""
+        with self._lock:
+            if self.subscriptions.pop(subscription_id, None) is None:
+                return False
+            self.save()
+            return True
+
+    def poll_due(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Poll every subscription whose interval has elapsed.
+
+        Subscriptions sharing a due subscription's query are polled with it,
+        since they ride on the same upstream request.
+
+        Returns:
+            Mapping of subscription id to number of papers delivered
+        """
+        now = now or datetime.now()
+        with self._lock:
+            due_keys = {
+                subscription.group_key
+                for subscription in self.subscriptions.values()
+                if subscription.next_poll_at is None
+                or datetime.fromisoformat(subscription.next_poll_at) <= now
+            }
+            return self.poll(
+                [s.id for s in self.subscriptions.values() if s.group_key in due_keys],
+                now=now
+            )
+
+    def poll(
+        self,
+        subscription_ids: Optional[List[str]] = None,
+        now: Optional[datetime] = None
+    ) -> Dict[str, int]:
+        """
+        Poll subscriptions now, regardless of schedule.
+
+        Args:
+            subscription_ids: Subscriptions to poll (default: all)
+            now: Poll time used for scheduling
+
+        Returns:
+            Mapping of subscription id to number of papers delivered
+        """
+        now = now or datetime.now()
+        delivered: Dict[str, int] = {}
+        with self._lock:
+            ids = subscription_ids if subscription_ids is not None else list(self.subscriptions)
+            groups: Dict[Tuple[str, str], List[Subscription]] = {}
+            for subscription_id in ids:
+                subscription = self.subscriptions[subscription_id]
+                groups.setdefault(subscription.group_key, []).append(subscription)
+
+            for group in groups.values():
+                try:
+                    new_papers = self._fetch_group(group)
+                except Exception as e:
+                    self.logger.error(f"Error polling subscription query {group[0].query!r}: {str(e)}")
+                    continue
+                for subscription in group:
+                    delivered[subscription.id] = self._deliver(subscription, new_papers[subscription.id])
+                    subscription.next_poll_at = (
+                        now + timedelta(minutes=subscription.interval_minutes)
+                    ).isoformat()
+            self.save()
+        return delivered
+
+    def run(self, check_seconds: float = 60.0, stop_event: Optional[threading.Event] = None) -> None:
+        """Poll due subscriptions until stop_event is set."""
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            self.poll_due()
+            stop_event.wait(check_seconds)
+
+    def read_inbox(self, subscription_id: str, clear: bool = False) -> List[PaperMetadata]:
+        """Return papers delivered to a subscription's inbox, oldest delivery first."""
+        inbox = self._inbox_path(subscription_id)
+        if not inbox.exists():
+            return []
+        with open(inbox, encoding="utf-8") as f:
+            papers = [PaperMetadata(**json.loads(line)) for line in f if line.strip()]
+        if clear:
+            inbox.unlink()
+        return papers
+
+    def save(self) -> None:
+        """Persist subscriptions, cursors and stats."""
+        with self._lock:
+            state = {
+                "subscriptions": [asdict(s) for s in self.subscriptions.values()],
+                "stats": asdict(self.stats),
+            }
+            self.path.mkdir(parents=True, exist_ok=True)
+            state_file = self.path / "subscriptions.json"
+            tmp_file = state_file.with_name(state_file.name + ".tmp")
+            tmp_file.write_text(json.dumps(state, indent=2), encoding="utf-8")
+            os.replace(tmp_file, state_file)
+
+    def _fetch_group(self, group: List[Subscription]) -> Dict[str, List[PaperMetadata]]:
+        """
+        Page through one shared query until every subscription in the group
+        has reached the start of its lookback window, or its max_results if it
+        has never been polled.
+        """
+        new_papers: Dict[str, List[PaperMetadata]] = {s.id: [] for s in group}
+        date_range = self._poll_date_range(group)
+        if date_range is not None and date_range["start_date"] > date_range["end_date"]:
+            return new_papers
+        # Incremental polls need every paper in the lookback window, however many
+        max_results = (
+            None if any(s.cursor is not None for s in group)
+            else max(s.max_results for s in group)
+        )
+
+        pending = list(group)
+        fetched = 0
+        exhausted = False
+        papers = self.scraper.iter_newest_papers(group[0].query, date_range, max_results)
+        for paper in papers:
+            fetched += 1
+            still_pending = []
+            for subscription in pending:
+                if subscription.cursor is None:
+                    new_papers[subscription.id].append(paper)
+                    if len(new_papers[subscription.id]) < subscription.max_results:
+                        still_pending.append(subscription)
+                elif paper.publication_date >= _lookback_start(subscription.cursor):
+                    if _is_new(subscription, paper):
+                        new_papers[subscription.id].append(paper)
+                    still_pending.append(subscription)
+            pending = still_pending
+            if not pending:
+                break
+        else:
+            exhausted = max_results is None or fetched < max_results
+
+        # ArXiv sends a full page per request however few entries are consumed,
+        # so only a result set that ran out was downloaded exactly
+        page_size = self.scraper.client.page_size
+        pages = max(1, math.ceil(fetched / page_size))
+        self.stats.polls += len(group)
+        self.stats.upstream_requests += pages
+        self.stats.entries_fetched += fetched if exhausted else pages * page_size
+        for subscription in group:
+            naive_pages = math.ceil(subscription.max_results / page_size)
+            self.stats.naive_requests += naive_pages
+            self.stats.naive_entries += naive_pages * page_size
+        return new_papers
+
+    @staticmethod
+    def _poll_date_range(group: List[Subscription]) -> Optional[Dict[str, str]]:
+        """
+        Narrow the upstream date filter to the oldest lookback window in the group.
+
+        The window starts ANNOUNCEMENT_LAG_DAYS before the cursor's date, so
+        papers announced after newer ones were delivered are still found.
+        """
+        date_range = group[0].date_range
+        if any(subscription.cursor is None for subscription in group):
+            return date_range
+        since = min(_lookback_start(subscription.cursor) for subscription in group)
+        date_range = date_range or {}
+        return {
+            "start_date": max(since, date_range.get("start_date", since)),
+            "end_date": date_range.get("end_date", date.today().isoformat()),
+        }
+
+    def _deliver(self, subscription: Subscription, papers: List[PaperMetadata]) -> int:
+        """Deliver new papers and advance the cursor; returns the number delivered."""
+        if not papers:
+            return 0
+        import requests
+
+        try:
+            records = [asdict(paper) for paper in papers]
+            if subscription.delivery == "webhook":
+                response = requests.post(
+                    subscription.target,
+                    json={"subscription_id": subscription.id, "query": subscription.query, "papers": records},
+                    timeout=WEBHOOK_TIMEOUT_SECONDS,
+                )
+                response.raise_for_status()
+            else:
+                path = (
+                    Path(subscription.target) if subscription.delivery == "file"
+                    else self._inbox_path(subscription.id)
+                )
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, "a", encoding="utf-8") as f:
+                    for record in reversed(records):
+                        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except (requests.RequestException, OSError) as e:
+            self.logger.error(f"Error delivering subscription {subscription.id}: {str(e)}")
+            return 0
+
+        if subscription.cursor is None and len(papers) >= subscription.max_results:
+            subscription.floor = _cursor_of(papers[-1])
+        newest = _cursor_of(papers[0])
+        if subscription.cursor is None or newest > tuple(subscription.cursor):
+            subscription.cursor = newest
+        subscription.delivered.update(
+            (paper_id, published) for published, paper_id in map(_cursor_of, papers)
+        )
+
+        # Forget papers that have dropped out of the next poll's lookback window
+        since = _lookback_start(subscription.cursor)
+        subscription.delivered = {
+            paper_id: published
+            for paper_id, published in subscription.delivered.items()
+            if published >= since
+        }
+        if subscription.floor is not None and subscription.floor[0] < since:
+            subscription.floor = None
+        self.stats.papers_delivered += len(papers)
+        return len(papers)
+
+    def _inbox_path(self, subscription_id: str) -> Path:
+        return self.path / "inbox" / f"{subscription_id}.jsonl"
@@ -1,8 +1,44 @@
 import pytest
 import logging
+from typing import Optional, Sequence
+
+from src.scraper.paper_scraper import PaperMetadata
+from tests.fake_arxiv import FakeArxiv
+
+
+def make_paper(
+    number: int,
+    title: Optional[str] = None,
+    abstract: str = "An abstract",
+    authors: Sequence[str] = ("Ada Lovelace",),
+    publication_date: str = "2024-01-01",
+    **fields
+) -> PaperMetadata:
+    """
+    Build a synthetic ArXiv paper with ID 2401.<number>.
+
+    Title defaults to 'Paper <number>'; other PaperMetadata fields such as
+    doi or citations pass through.
+    """
+    return PaperMetadata(
+        title=title if title is not None else f"Paper {number}",
+        authors=list(authors),
+        abstract=abstract,
+        publication_date=publication_date,
+        url=f"http://arxiv.org/abs/2401.{number:05d}v1",
+        pdf_url=f"http://arxiv.org/pdf/2401.{number:05d}v1",
+        **fields
+    )
+
 
 @pytest.fixture(autouse=True)
 def setup_logging():
     """Configure logging for tests"""
     logging.basicConfig(level=logging.INFO)
-    return logging.getLogger(__name__)
\ No newline at end of file
+    return logging.getLogger(__name__)
+
+@pytest.fixture
+def fake_arxiv():
+    """A local fake ArXiv API, shut down after the test"""
+    with FakeArxiv() as server:
+        yield server
@@ -0,0 +1,160 @@
+"""Local stand-in for the ArXiv API, shared by the tests and benchmarks."""
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlsplit
+
+FEED_HEADER = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom"
+      xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">
+<opensearch:totalResults>{total}</opensearch:totalResults>
+"""
+
+ENTRY = """<entry>
+<id>http://arxiv.org/abs/{paper_id}v1</id>
+<updated>2024-01-02T00:00:00Z</updated>
+<published>2024-01-01T00:00:00Z</published>
+<title>Fake paper</title>
+<summary>An abstract</summary>
+<author><name>Ada Lovelace</name></author>
+<link title="pdf" href="http://arxiv.org/pdf/{paper_id}v1" rel="related" type="application/pdf"/>
+<arxiv:primary_category term="cs.LG"/>
+</entry>
+"""
+
+
+def feed(start: int = 0, count: int = 1, total: int = 1) -> bytes:
+    """An Atom feed page with entries start..start+count of a result set of total papers."""
+    entries = "".join(
+        ENTRY.format(paper_id=f"2401.{number + 1:05d}")
+        for number in range(start, min(start + count, total))
+    )
+    return (FEED_HEADER.format(total=total) + entries + "</feed>").encode()
+
+
+FEED = feed()
+
+
+@dataclass
+class Reply:
+    """A scripted response; the default is the requested page of the feed."""
+
+    status: int = 200
+    headers: Dict[str, str] = field(default_factory=dict)
+    delay: float = 0.0
+    empty: bool = False  # 200 with no entries, as ArXiv sometimes returns mid-pagination
+    truncate: bool = False  # hang up halfway through the body
+
+
+class FakeArxiv(ThreadingHTTPServer):
+    """
+    Local stand-in for the ArXiv API.
+
+    Each GET pops the next Reply from script. Once the script is exhausted,
+    a seeded random error_rate share of requests gets a 503 and a hang_rate
+    share stalls for hang seconds; every other request waits latency seconds
+    and gets the requested page of a result set of total_results papers.
+    connect_delay is added to every new connection, standing in for DNS and
+    TLS setup. Connections are kept alive, so pooled clients reuse them.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        total_results: int = 1,
+        connect_delay: float = 0.0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        hang_rate: float = 0.0,
+        hang: float = 0.0,
+        seed: int = 0
+    ):
+        super().__init__(("127.0.0.1", 0), FakeArxivHandler)
+        self.script: List[Reply] = []
+        self.total_results = total_results
+        self.connect_delay = connect_delay
+        self.latency = latency
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.hang = hang
+        self.requests = 0
+        self.heads: List[str] = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @property
+    def query_url_format(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/api/query?{{}}"
+
+    def start(self) -> "FakeArxiv":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "FakeArxiv":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def next_reply(self) -> Reply:
+        with self._lock:
+            self.requests += 1
+            if self.script:
+                return self.script.pop(0)
+            roll = self._rng.random()
+        if roll < self.error_rate:
+            return Reply(503, delay=self.latency)
+        if roll < self.error_rate + self.hang_rate:
+            return Reply(delay=self.hang)
+        return Reply(delay=self.latency)
+
+
+class FakeArxivHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        time.sleep(self.server.connect_delay)
+
+    def do_GET(self):
+        server = self.server
+        reply = server.next_reply()
+        time.sleep(reply.delay)
+        if reply.status != 200:
+            body = b"error"
+        else:
+            params = parse_qs(urlsplit(self.path).query)
+            start = int(params.get("start", ["0"])[0])
+            count = 0 if reply.empty else int(params.get("max_results", ["100"])[0])
+            body = feed(start, count, server.total_results)
+        try:
+            self.send_response(reply.status)
+            for name, value in reply.headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if reply.truncate:
+                self.wfile.write(body[:len(body) // 2])
+                self.close_connection = True
+            else:
+                self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client timed out and hung up
+
+    def do_HEAD(self):
+        self.server.heads.append(self.path)
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
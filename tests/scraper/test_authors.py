@@ -0,0 +1,190 @@
+"""Tests for the author index and author-centric queries."""
+
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+import sys
+
+import pytest
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.scraper.arxiv_scraper import ArxivScraper
+from src.scraper.authors import AuthorIndex, normalize_author
+from tests.conftest import make_paper
+
+
+@pytest.fixture
+def index():
+    """Provide an index with a few overlapping authors."""
+    index = AuthorIndex()
+    index.add([
+        make_paper(1, authors=["John Smith", "Ada Lovelace"], publication_date="2024-01-05"),
+        make_paper(2, authors=["J. Smith"], publication_date="2024-03-01"),
+        make_paper(3, authors=["Ada Lovelace", "Hans Müller"], publication_date="2024-02-10"),
+        make_paper(4, authors=["Grace Hopper"], publication_date="2024-04-01"),
+    ])
+    return index
+
+
+@pytest.mark.parametrize("name, key", [
+    ("John R. Smith", "smith_j"),
+    ("Smith, John", "smith_j"),
+    ("J. Smith", "smith_j"),
+    ("Hans Müller", "muller_h"),
+    ("Ludwig van Beethoven", "van_beethoven_l"),
+    ("Martin Luther King Jr.", "king_m"),
+    ("Plato", "plato"),
+])
+def test_normalize_author(name, key):
+    """Test that spelling variants collapse onto one key"""
+    assert normalize_author(name) == key
+
+
+def test_paper_ids_by_merges_authors_newest_first(index):
+    """Test multi-author lookup ordering and deduplication"""
+    paper_ids = index.paper_ids_by(["Smith, John", "Ada Lovelace"])
+    assert paper_ids == ["2401.00002", "2401.00003", "2401.00001"]
+    assert index.get(paper_ids[0]).title == "Paper 2"
+
+
+def test_paper_ids_by_date_bounds(index):
+    """Test that date bounds are inclusive"""
+    paper_ids = index.paper_ids_by(["J Smith", "Lovelace, A."], "2024-01-05", "2024-02-10")
+    assert paper_ids == ["2401.00003", "2401.00001"]
+
+
+def test_coauthors(index):
+    """Test co-author adjacency"""
+    assert index.coauthors("Ada Lovelace") == [("John Smith", 1), ("Hans Müller", 1)]
+
+
+def test_coverage_gaps(index):
+    """Test that only uncovered date ranges are reported as missing"""
+    index.mark_covered(["John Smith"], "2024-01-01", "2024-01-31")
+    index.mark_covered(["John Smith"], "2024-03-01", "2024-03-31")
+    assert index.missing_ranges("J. Smith", "2024-01-15", "2024-04-10") == [
+        (date(2024, 2, 1), date(2024, 2, 29)),
+        (date(2024, 4, 1), date(2024, 4, 10)),
+    ]
+    index.mark_covered(["John Smith"], "2024-02-01", "2024-02-29")
+    assert index.missing_ranges("J. Smith", "2024-01-15", "2024-03-31") == []
+
+
+def test_coverage_leaves_announcement_lag(index):
+    """Test that days whose papers may still be announced are never marked as fully fetched"""
+    today = date.today()
+    lag = index.announcement_lag_days
+    index.mark_covered(["Grace Hopper"], today - timedelta(days=30), today)
+    assert index.missing_ranges("Grace Hopper", today - timedelta(days=30), today) == [
+        (today - timedelta(days=lag - 1), today)
+    ]
+
+
+def test_appends_survive_restart(index, tmp_path):
+    """Test that postings and coverage are persisted as they are added, without save()"""
+    persisted = AuthorIndex(tmp_path / "authors.jsonl")
+    persisted.add([make_paper(1, authors=["John Smith"], publication_date="2024-01-05")])
+    persisted.mark_covered(["John Smith"], "2024-01-01", "2024-01-31")
+    persisted.add([make_paper(2, authors=["J. Smith"], publication_date="2024-03-01")])
+
+    reopened = AuthorIndex(persisted.path)
+    assert reopened.paper_ids_by(["Smith, J."]) == ["2401.00002", "2401.00001"]
+    assert reopened.missing_ranges("John Smith", "2024-01-01", "2024-01-31") == []
+    assert reopened.get("2401.00001") is None  # metadata is not persisted
+
+
+def test_save_compacts_postings(index, tmp_path):
+    """Test that save() rewrites the file with postings and merged coverage only"""
+    index.path = tmp_path / "authors.jsonl"
+    index.mark_covered(["Grace Hopper"], "2024-01-01", "2024-03-31")
+    index.mark_covered(["Grace Hopper"], "2024-04-01", "2024-06-30")
+    index.save()
+
+    assert len(index.path.read_text(encoding="utf-8").splitlines()) == 5
+    assert "abstract" not in index.path.read_text(encoding="utf-8")
+    reopened = AuthorIndex(index.path)
+    assert len(reopened) == 4
+    assert reopened.coauthors("Ada Lovelace") == index.coauthors("Ada Lovelace")
+    assert reopened.missing_ranges("Grace Hopper", "2024-01-01", "2024-06-30") == []
+
+
+def fake_result(number: int, authors, published: str):
+    return SimpleNamespace(
+        title=f"Fetched {number}",
+        authors=[SimpleNamespace(name=name) for name in authors],
+        summary="An abstract",
+        published=datetime.fromisoformat(published),
+        entry_id=f"http://arxiv.org/abs/2402.{number:05d}v1",
+        pdf_url=f"http://arxiv.org/pdf/2402.{number:05d}v1",
+    )
+
+
+@pytest.mark.asyncio
+async def test_papers_by_authors_batches_missing_ranges(index, monkeypatch):
+    """Test that authors sharing a gap are fetched in one request, and only once"""
+    scraper = ArxivScraper(author_index=index)
+    queries = []
+
+    def fake_results(search):
+        queries.append(search.query)
+        return iter([fake_result(1, ["Ada Lovelace"], "2024-05-02")])
+
+    monkeypatch.setattr(scraper.client, "results", fake_results)
+
+    papers = await scraper.papers_by_authors(
+        ["John Smith", "Ada Lovelace"], "2024-01-01", "2024-05-31"
+    )
+    assert len(queries) == 1
+    assert "au:smith_j OR au:lovelace_a" in queries[0]
+    assert queries[0].endswith("AND submittedDate:[202401010000 TO 202405312359]")
+    assert [p.title for p in papers] == ["Fetched 1", "Paper 2", "Paper 3", "Paper 1"]
+
+    # The whole range is now covered locally
+    await scraper.papers_by_authors(["J. Smith"], "2024-02-01", "2024-05-31")
+    assert len(queries) == 1
+
+
+@pytest.mark.asyncio
+async def test_papers_by_authors_fetches_uncached_papers_by_id(index, tmp_path, monkeypatch):
+    """Test that papers indexed before a restart are fetched by ID in one request"""
+    index.path = tmp_path / "authors.jsonl"
+    index.mark_covered(["Ada Lovelace"], "2024-01-01", "2024-06-30")
+    index.save()
+    scraper = ArxivScraper(author_index=AuthorIndex(index.path))
+    id_lists = []
+
+    def fake_results(search):
+        id_lists.append(search.id_list)
+        return iter([
+            SimpleNamespace(
+                title=f"Refetched {paper_id}",
+                authors=[SimpleNamespace(name="Ada Lovelace")],
+                summary="An abstract",
+                published=datetime(2024, 1, 5),
+                entry_id=f"http://arxiv.org/abs/{paper_id}v1",
+                pdf_url=f"http://arxiv.org/pdf/{paper_id}v1",
+            )
+            for paper_id in search.id_list
+        ])
+
+    monkeypatch.setattr(scraper.client, "results", fake_results)
+
+    papers = await scraper.papers_by_authors(["Ada Lovelace"], "2024-01-01", "2024-06-30")
+    assert id_lists == [["2401.00003", "2401.00001"]]
+    assert [p.title for p in papers] == ["Refetched 2401.00003", "Refetched 2401.00001"]
+
+    # Fetched metadata is cached for the next query
+    await scraper.papers_by_authors(["Ada Lovelace"], "2024-01-01", "2024-06-30")
+    assert len(id_lists) == 1
+
+
+def test_date_filter_covers_whole_days():
+    """Test that date ranges use ArXiv's YYYYMMDDTTTT form, inclusive of the last day"""
+    search = ArxivScraper()._build_search(
+        "au:lovelace_a", None, {"start_date": "2024-02-01", "end_date": "2024-02-29"}, "date"
+    )
+    assert search.query == "au:lovelace_a AND submittedDate:[202402010000 TO 202402292359]"
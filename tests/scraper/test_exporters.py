@@ -0,0 +1,106 @@
+"""Tests for the streaming paper exporters."""
+
+import csv
+import gzip
+import io
+import json
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.scraper.exporters import (
+    export_papers,
+    format_from_path,
+    get_exporter,
+    stream_export,
+)
+from tests.conftest import make_paper
+
+
+def make_papers(count: int):
+    """Generate synthetic papers lazily."""
+    for i in range(count):
+        yield make_paper(i, abstract=f"Abstract number {i}, with a comma", authors=[f"Author {i}", "Ada Lovelace"])
+
+
+def test_jsonl_roundtrip(tmp_path):
+    """Test that JSONL output has one decodable object per paper"""
+    path = tmp_path / "papers.jsonl"
+    count = export_papers(make_papers(25), path, batch_size=10)
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert count == 25
+    assert len(lines) == 25
+    assert json.loads(lines[3])["authors"] == ["Author 3", "Ada Lovelace"]
+
+
+def test_csv_gzip_roundtrip(tmp_path):
+    """Test gzip-compressed CSV output with header and joined authors"""
+    path = tmp_path / "papers.csv.gz"
+    export_papers(make_papers(5), path, compression="gzip", batch_size=2)
+
+    with gzip.open(path, "rt", encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 5
+    assert rows[0]["authors"] == "Author 0; Ada Lovelace"
+    assert rows[0]["abstract"] == "Abstract number 0, with a comma"
+
+
+def test_csv_empty_export_has_header():
+    """Test that an empty CSV export still contains the header row"""
+    data = b"".join(stream_export([], "csv"))
+    assert data.decode("utf-8").startswith("title,authors,abstract")
+
+
+def test_parquet_row_groups():
+    """Test that each batch becomes one Parquet row group"""
+    pq = pytest.importorskip("pyarrow.parquet")
+    data = b"".join(stream_export(make_papers(25), "parquet", "zstd", batch_size=10))
+
+    parquet_file = pq.ParquetFile(io.BytesIO(data))
+    assert parquet_file.num_row_groups == 3
+    table = parquet_file.read()
+    assert table.num_rows == 25
+    assert table.column("authors")[0].as_py() == ["Author 0", "Ada Lovelace"]
+
+
+def test_arrow_roundtrip():
+    """Test Arrow IPC output with compression"""
+    pa = pytest.importorskip("pyarrow")
+    data = b"".join(stream_export(make_papers(12), "arrow", "lz4", batch_size=5))
+
+    reader = pa.ipc.open_file(io.BytesIO(data))
+    assert reader.num_record_batches == 3
+    assert reader.read_all().num_rows == 12
+
+
+def test_stream_export_yields_incrementally():
+    """Test that output is produced batch by batch rather than at the end"""
+    consumed = []
+
+    def tracked():
+        for paper in make_papers(30):
+            consumed.append(paper)
+            yield paper
+
+    chunks = stream_export(tracked(), "jsonl", batch_size=10)
+    first = next(chunks)
+    assert first.count(b"\n") == 10
+    assert len(consumed) == 10
+
+
+def test_invalid_options():
+    """Test that unknown formats and codecs are rejected"""
+    with pytest.raises(ValueError):
+        get_exporter("xml", io.BytesIO())
+    with pytest.raises(ValueError):
+        get_exporter("csv", io.BytesIO(), compression="zstd")
+    with pytest.raises(ValueError):
+        format_from_path("papers.txt")
+    assert format_from_path("papers.jsonl.gz") == "jsonl"
@@ -0,0 +1,221 @@
+"""Tests for deadlines, retries and circuit breaking against a local fake ArXiv."""
+
+from pathlib import Path
+import sys
+import time
+
+import arxiv
+import pytest
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.scraper.arxiv_scraper import EMPTY_PAGE_RETRIES, ArxivScraper
+from src.scraper.exporters import export_papers
+from src.scraper.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceededError,
+    RetryPolicy,
+    UpstreamUnavailableError,
+    allow_stale,
+    deadline,
+    parse_retry_after,
+    remaining_time,
+)
+from src.scraper.session import ResilientSession
+from tests.fake_arxiv import Reply, feed
+
+@pytest.fixture
+def scraper(fake_arxiv):
+    """Scraper pointed at the fake server, with millisecond backoff."""
+    scraper = ArxivScraper(
+        retry_policy=RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=1.0, request_timeout=1.0),
+        circuit_breaker=CircuitBreaker(window=4, min_calls=4, failure_ratio=0.75, cooldown=60.0),
+    )
+    scraper.client.query_url_format = fake_arxiv.query_url_format
+    scraper.client.delay_seconds = 0
+    return scraper
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_errors(scraper, fake_arxiv):
+    """Test that 5xx responses are retried until the upstream recovers"""
+    fake_arxiv.script = [Reply(503), Reply(502)]
+    papers = await scraper.search_papers("anything", max_results=1)
+    assert [p.title for p in papers] == ["Fake paper"]
+    assert fake_arxiv.requests == 3
+    assert scraper.session.stats.retries == 2
+
+
+@pytest.mark.asyncio
+async def test_honours_retry_after(scraper, fake_arxiv):
+    """Test that a 429 waits for Retry-After rather than the backoff"""
+    fake_arxiv.script = [Reply(429, {"Retry-After": "0.3"})]
+    started = time.monotonic()
+    papers = await scraper.search_papers("anything", max_results=1)
+    assert len(papers) == 1
+    assert time.monotonic() - started >= 0.3
+
+
+@pytest.mark.asyncio
+async def test_retry_after_beyond_budget_fails_fast(scraper, fake_arxiv):
+    """Test that a Retry-After longer than the deadline is surfaced, not slept"""
+    fake_arxiv.script = [Reply(503, {"Retry-After": "120"})]
+    started = time.monotonic()
+    with pytest.raises(UpstreamUnavailableError) as excinfo:
+        await scraper.search_papers("anything", max_results=1, timeout=5)
+    assert time.monotonic() - started < 1
+    assert excinfo.value.retry_after == pytest.approx(120)
+    assert fake_arxiv.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_slow_upstream(scraper, fake_arxiv):
+    """Test that a hanging upstream is cut off at the caller's deadline"""
+    fake_arxiv.script = [Reply(delay=2)] * 3
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        await scraper.search_papers("anything", max_results=1, timeout=0.5)
+    assert time.monotonic() - started < 1
+
+
+@pytest.mark.asyncio
+async def test_exhausted_retries_raise_instead_of_empty(scraper, fake_arxiv):
+    """Test that an outage is distinguishable from a query with no matches"""
+    fake_arxiv.script = [Reply(500)] * 3
+    with pytest.raises(UpstreamUnavailableError):
+        await scraper.search_papers("anything", max_results=1)
+    assert fake_arxiv.requests == 3
+
+
+def test_stream_errors_fail_the_export(scraper, fake_arxiv, tmp_path):
+    """Test that an error mid-stream fails the export instead of truncating it"""
+    fake_arxiv.total_results = 3
+    scraper.client.page_size = 1
+    fake_arxiv.script = [Reply()] + [Reply(400)] * (EMPTY_PAGE_RETRIES + 1)
+    path = tmp_path / "papers.jsonl"
+    path.write_text("previous export\n")
+    with pytest.raises(arxiv.HTTPError):
+        export_papers(scraper.iter_papers("anything", max_results=3), path)
+    # Neither a partial file nor its temporary sibling is left behind
+    assert path.read_text() == "previous export\n"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_retries_empty_pages(scraper, fake_arxiv):
+    """Test that an empty page mid-pagination is retried rather than ending the results"""
+    fake_arxiv.total_results = 3
+    scraper.client.page_size = 1
+    fake_arxiv.script = [Reply(), Reply(empty=True)]
+    assert len(list(scraper.iter_papers("anything", max_results=3))) == 3
+
+
+def test_persistent_empty_pages_fail_the_export(scraper, fake_arxiv, tmp_path):
+    """Test that an export never reports success with only some of the papers"""
+    fake_arxiv.total_results = 3
+    scraper.client.page_size = 1
+    fake_arxiv.script = [Reply()] + [Reply(empty=True)] * (EMPTY_PAGE_RETRIES + 1)
+    with pytest.raises(UpstreamUnavailableError):
+        export_papers(scraper.iter_papers("anything", max_results=3), tmp_path / "papers.jsonl")
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_and_serves_stale(scraper, fake_arxiv):
+    """Test that an open circuit skips the upstream and falls back to cached pages"""
+    fresh = await scraper.search_papers("anything", max_results=1)
+
+    fake_arxiv.script = [Reply(503)] * 3
+    stale = await scraper.search_papers("anything", max_results=1)
+    assert [p.title for p in stale] == [p.title for p in fresh]
+    assert scraper.session.breaker.state == CircuitBreaker.OPEN
+    assert scraper.session.stats.stale_served == 1
+
+    # While open, cached queries are answered locally and uncached ones fail fast
+    requests_before = fake_arxiv.requests
+    assert len(await scraper.search_papers("anything", max_results=1)) == 1
+    with pytest.raises(CircuitOpenError):
+        await scraper.search_papers("something else", max_results=1)
+    assert fake_arxiv.requests == requests_before
+
+
+def test_streams_never_serve_stale_pages(scraper, fake_arxiv):
+    """Test that a paginated stream fails rather than mixing in a cached page"""
+    fake_arxiv.total_results = 2
+    scraper.client.page_size = 1
+    with allow_stale():
+        assert len(list(scraper.iter_papers("anything", max_results=2))) == 2
+
+    fake_arxiv.script = [Reply()] + [Reply(503)] * 3
+    with pytest.raises(UpstreamUnavailableError):
+        list(scraper.iter_papers("anything", max_results=2))
+    assert scraper.session.stats.stale_served == 0
+
+
+def test_stale_cache_is_bounded_by_bytes(fake_arxiv):
+    """Test that the oldest cached responses are evicted once the byte budget is spent"""
+    fake_arxiv.total_results = 3
+    session = ResilientSession(stale_cache_bytes=2 * len(feed(0, 1, 3)))
+    url = fake_arxiv.query_url_format
+    with allow_stale():
+        for page in range(3):
+            session.get(url.format(f"start={page}&max_results=1"))
+    assert list(session._stale) == [url.format(f"start={page}&max_results=1") for page in (1, 2)]
+    assert session._stale_bytes == sum(len(content) for _, content, _ in session._stale.values())
+
+
+def test_circuit_half_open_probe():
+    """Test that one probe is let through after the cooldown and closes the circuit"""
+    breaker = CircuitBreaker(window=2, min_calls=2, failure_ratio=0.5, cooldown=0.05)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert not breaker.allow_request()
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_failed_probe_reopens_circuit(fake_arxiv):
+    """Test that a probe failing with a non-connection error does not wedge the circuit half-open"""
+    breaker = CircuitBreaker(window=2, min_calls=2, failure_ratio=0.5, cooldown=0.05)
+    session = ResilientSession(RetryPolicy(max_attempts=1, request_timeout=1.0), breaker)
+    url = fake_arxiv.query_url_format.format("search_query=anything")
+    breaker.record_failure()
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    fake_arxiv.script = [Reply(truncate=True)]
+    with pytest.raises(UpstreamUnavailableError, match="ChunkedEncodingError"):
+        session.get(url)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    time.sleep(0.06)
+    assert session.get(url).status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_nested_deadlines_only_tighten():
+    """Test deadline propagation through nested scopes"""
+    assert remaining_time() is None
+    with deadline(10):
+        with deadline(60):
+            assert remaining_time() <= 10
+        with deadline(None):
+            assert remaining_time() <= 10
+    assert remaining_time() is None
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("7", 7.0),
+    ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0),
+    ("soon", None),
+    (None, None),
+])
+def test_parse_retry_after(value, expected):
+    """Test both Retry-After forms"""
+    assert parse_retry_after(value) == expected
@@ -0,0 +1,123 @@
+"""Tests for the offline related-papers similarity index."""
+
+from pathlib import Path
+import sys
+import threading
+
+import pytest
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.scraper.arxiv_scraper import ArxivScraper
+from src.scraper.paper_scraper import PaperMetadata
+from src.scraper.similarity import SimilarityIndex, tokenize
+from tests.conftest import make_paper
+
+
+PAPERS = [
+    make_paper(1, "Quantum error correction", "Surface codes reach high error correction thresholds."),
+    make_paper(2, "Topological quantum memory", "Surface codes protect a topological quantum memory."),
+    make_paper(3, "Convolutional networks", "Deep convolutional neural networks classify images."),
+    make_paper(4, "Graph neural networks", "Message passing neural networks operate on graphs."),
+    make_paper(5, "Galaxy rotation curves", "Dark matter halos explain flat rotation curves."),
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Provide a small persisted index."""
+    index = SimilarityIndex(tmp_path / "index", n_features=2 ** 16)
+    index.add(PAPERS)
+    index.save()
+    return index
+
+
+def test_tokenize_strips_stop_words_and_diacritics():
+    """Test tokenization of titles and abstracts"""
+    assert tokenize("The Schrödinger equation of a qubit") == ["schrodinger", "equation", "qubit"]
+
+
+def test_related_ranks_topical_neighbours_first(index):
+    """Test that related papers share vocabulary with the query paper"""
+    related = index.related("2401.00001", k=3)
+    assert related[0][0] == "2401.00002"
+    assert all(paper_id != "2401.00001" for paper_id, _ in related)
+    assert all(0 < score <= 1 for _, score in related)
+
+
+def test_related_accepts_versioned_ids(index):
+    """Test that version suffixes are ignored when looking up papers"""
+    assert index.related("2401.00003v2", k=1) == index.related("2401.00003", k=1)
+
+
+def test_related_unknown_paper(index):
+    """Test that unknown papers yield no results"""
+    assert index.related("9999.99999") == []
+
+
+def test_incremental_add_is_searchable_before_compaction(index):
+    """Test that papers in the in-memory delta are scored alongside the segment"""
+    index.compact_threshold = 100
+    index.add([make_paper(6, "Neural network pruning", "Pruning deep neural networks.")])
+    assert "2401.00006" in index
+    assert index._delta_ids == ["2401.00006"]
+
+    related_ids = [paper_id for paper_id, _ in index.related("2401.00006", k=2)]
+    assert set(related_ids) == {"2401.00003", "2401.00004"}
+
+
+def test_compaction_runs_in_background(tmp_path, monkeypatch):
+    """Test that add() never waits for compaction, and queries and additions continue during it"""
+    index = SimilarityIndex(tmp_path / "index", n_features=2 ** 16, compact_threshold=len(PAPERS))
+    writing, release = threading.Event(), threading.Event()
+    write = index._write
+
+    def slow_write(segment):
+        writing.set()
+        release.wait(5)
+        write(segment)
+
+    monkeypatch.setattr(index, "_write", slow_write)
+    index.add(PAPERS)
+    assert writing.wait(5)
+    assert index.related("2401.00001", k=1)[0][0] == "2401.00002"
+    index.add([make_paper(6, "Neural network pruning", "Pruning deep neural networks.")])
+
+    release.set()
+    index.save()
+    assert index._delta_ids == []
+    reopened = SimilarityIndex(index.path)
+    assert len(reopened) == len(PAPERS) + 1
+    assert reopened.related("2401.00006", k=2) == index.related("2401.00006", k=2)
+
+
+def test_duplicates_are_skipped(index):
+    """Test that re-adding known papers is a no-op"""
+    assert index.add(PAPERS) == 0
+    assert len(index) == len(PAPERS)
+
+
+def test_reopen_from_disk(index):
+    """Test that a saved index can be memory-mapped and queried again"""
+    reopened = SimilarityIndex(index.path)
+    assert len(reopened) == len(PAPERS)
+    assert reopened.related("2401.00004", k=2) == index.related("2401.00004", k=2)
+
+
+def test_query_many_matches_single_queries(index):
+    """Test that batched scoring agrees with one-at-a-time scoring"""
+    texts = ["surface codes", "neural networks", "dark matter"]
+    assert index.query_many(texts, k=2) == [index.query(text, k=2) for text in texts]
+
+
+def test_exports_are_not_indexed(tmp_path, fake_arxiv):
+    """Test that streaming a bulk export leaves the index untouched"""
+    index = SimilarityIndex(tmp_path / "index", n_features=2 ** 16)
+    scraper = ArxivScraper(similarity_index=index)
+    scraper.client.query_url_format = fake_arxiv.query_url_format
+    fake_arxiv.total_results = 3
+    assert len(list(scraper.iter_papers("anything"))) == 3
+    assert len(index) == 0
@@ -0,0 +1,84 @@
+"""Tests for the import-time budget and prewarming of the scraper package."""
+
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.scraper.arxiv_scraper import ArxivScraper
+from src.scraper.authors import AuthorIndex
+from tests.conftest import make_paper
+
+# Modules that must stay cheap to import: CLI invocations, the Streamlit app
+# and backend workers import them before doing any work
+LIGHT_MODULES = (
+    "src.scraper",
+    "src.scraper.paper_scraper",
+    "src.scraper.resilience",
+    "src.scraper.authors",
+    "src.scraper.exporters",
+    "src.scraper.arxiv_scraper",
+    "src.scraper.subscriptions",
+)
+HEAVY_DEPENDENCIES = ("requests", "bs4", "arxiv", "numpy", "scipy", "pyarrow", "zstandard")
+# Best of three cold imports; eagerly importing arxiv or scipy costs several times this
+IMPORT_BUDGET_SECONDS = 0.25
+
+
+def run_python(code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=project_root, capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip()
+
+
+@pytest.mark.parametrize("module", LIGHT_MODULES)
+def test_no_heavy_imports(module):
+    """Test that heavy dependencies are only imported on first use"""
+    loaded = run_python(
+        f"import sys; import {module}; from src.scraper.arxiv_scraper import ArxivScraper; ArxivScraper(); "
+        f"print(' '.join(name for name in {HEAVY_DEPENDENCIES!r} if name in sys.modules))"
+    )
+    assert loaded == ""
+
+
+def test_import_budget():
+    """Test that importing the whole light scraper stack stays within budget"""
+    imports = "; ".join(f"import {module}" for module in LIGHT_MODULES)
+    timings = [
+        float(run_python(f"import time; start = time.perf_counter(); {imports}; print(time.perf_counter() - start)"))
+        for _ in range(3)
+    ]
+    assert min(timings) < IMPORT_BUDGET_SECONDS
+
+
+def test_prewarm_opens_connection_once(fake_arxiv):
+    """Test that prewarming connects to the API host in the background, only once"""
+    scraper = ArxivScraper()
+    scraper.client.query_url_format = fake_arxiv.query_url_format
+
+    thread = scraper.prewarm()
+    thread.join(5)
+    assert scraper.prewarm() is thread
+    scraper.prewarm(background=False)
+    assert fake_arxiv.heads == ["/"]
+    assert scraper.session.stats.requests == 0
+
+
+def test_prewarm_loads_author_index(fake_arxiv, tmp_path):
+    """Test that the author index file is read by prewarm(), not when the index is created"""
+    AuthorIndex(tmp_path / "authors.jsonl").add([make_paper(1)])
+    index = AuthorIndex(tmp_path / "authors.jsonl")
+    assert not index._loaded
+
+    scraper = ArxivScraper(author_index=index)
+    scraper.client.query_url_format = fake_arxiv.query_url_format
+    scraper.prewarm(background=False)
+    assert index._loaded
+    assert index.paper_ids_by(["A. Lovelace"]) == ["2401.00001"]
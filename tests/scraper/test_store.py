@@ -0,0 +1,109 @@
+"""Tests for the compressed on-disk paper store."""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.scraper.paper_scraper import PaperMetadata
+from src.scraper.store import PaperStore, decode_paper, encode_paper
+from tests.conftest import make_paper
+
+WORDS = "quantum error correction surface code threshold decoder noise qubit lattice".split()
+
+
+def sample_paper(number: int) -> PaperMetadata:
+    """A paper exercising every field, some left empty."""
+    return make_paper(
+        number,
+        abstract=" ".join(WORDS[(number + i) % len(WORDS)] for i in range(60)),
+        authors=[f"Author {number % 7}", "Ada Lovelace"],
+        publication_date=f"2024-{number % 12 + 1:02d}-01",
+        doi=f"10.1000/{number}" if number % 3 == 0 else None,
+        citations=number if number % 2 else None,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Provide a store large enough to train a dictionary."""
+    papers = [sample_paper(number) for number in range(1000)]
+    with PaperStore.write(tmp_path / "papers", papers, block_size=8, training_samples=500) as store:
+        yield store
+
+
+@pytest.mark.parametrize("paper", [
+    sample_paper(3),
+    sample_paper(4),
+    PaperMetadata(title="Ünïcode", authors=[], abstract="", publication_date="", url="https://example.org/x"),
+])
+def test_record_round_trip(paper):
+    """Test that every field survives binary encoding"""
+    assert decode_paper(encode_paper(paper)) == paper
+
+
+def test_url_prefixes_are_elided():
+    """Test that ArXiv URL prefixes cost one byte"""
+    record = encode_paper(sample_paper(1))
+    assert b"arxiv.org" not in record
+
+
+def test_get(store):
+    """Test point lookups, with and without version suffixes"""
+    assert store.get("2401.00042") == sample_paper(42)
+    assert store.get("2401.00999v2") == sample_paper(999)
+    assert store.get("2401.01000") is None
+    assert store.get("a-much-longer-id-than-any-stored-one") is None
+    assert "2401.00000" in store
+    assert len(store) == 1000
+
+
+def test_get_non_arxiv_ids(tmp_path):
+    """Test that DOIs ending in something like a version suffix are found as stored"""
+    paper = PaperMetadata(
+        title="Versioned DOI", authors=[], abstract="", publication_date="2024-01-01", doi="10.48550/abc.v2"
+    )
+    with PaperStore.write(tmp_path / "papers", [paper, sample_paper(1)]) as store:
+        assert store.get("10.48550/abc.v2") == paper
+        assert store.get("10.48550/abc.") is None
+        assert store.get("hep-th/9901001v3") is None
+
+
+def test_get_many(store):
+    """Test batched lookups keep the requested order"""
+    papers = store.get_many(["2401.00500", "missing", "2401.00001"])
+    assert papers == [sample_paper(500), None, sample_paper(1)]
+
+
+def test_iteration_in_write_order(store):
+    """Test full scans"""
+    assert [paper.title for paper in store][:3] == ["Paper 0", "Paper 1", "Paper 2"]
+
+
+def test_compression(store):
+    """Test that the dictionary was trained and the store beats JSON lines"""
+    assert store.meta["dictionary_bytes"] > 0
+    assert store.compression_ratio > 5
+
+
+def test_rewrite_replaces_and_skips_duplicates(store, tmp_path):
+    """Test that rewriting swaps in the new store and drops repeated IDs"""
+    rewritten = PaperStore.write(store.path, [sample_paper(1), sample_paper(2), sample_paper(1)])
+    assert len(rewritten) == 2
+    assert [paper.title for paper in rewritten] == ["Paper 1", "Paper 2"]
+    assert rewritten.meta["dictionary_bytes"] == 0
+    rewritten.close()
+
+
+def test_empty_store(tmp_path):
+    """Test that an empty store can be written and read"""
+    store = PaperStore.write(tmp_path / "empty", [])
+    assert len(store) == 0
+    assert store.get("2401.00001") is None
+    assert list(store) == []
+    store.close()
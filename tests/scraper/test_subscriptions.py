@@ -0,0 +1,203 @@
+"""Tests for saved-query subscriptions and incremental polling."""
+
+from datetime import datetime, timedelta
+import json
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.scraper.arxiv_scraper import ArxivScraper
+from src.scraper.subscriptions import SubscriptionManager, query_key
+from tests.conftest import make_paper
+
+
+class FakeFeed:
+    """Stands in for ArxivScraper.iter_newest_papers, newest first."""
+
+    def __init__(self, numbers):
+        self.numbers = list(numbers)
+        self.published = {}  # number -> date, for papers announced after newer ones
+        self.calls = []
+        self.consumed = 0
+
+    def __call__(self, query, date_range=None, max_results=None):
+        self.calls.append((query, date_range, max_results))
+        papers = sorted(
+            (make_paper(number, publication_date=self.published.get(number, f"2024-01-{number:02d}"))
+             for number in self.numbers),
+            key=lambda paper: (paper.publication_date, paper.url),
+            reverse=True,
+        )
+        if date_range:
+            papers = [p for p in papers if p.publication_date >= date_range["start_date"]]
+        for paper in papers[:max_results]:
+            self.consumed += 1
+            yield paper
+
+
+@pytest.fixture
+def feed(monkeypatch):
+    scraper = ArxivScraper()
+    feed = FakeFeed(range(1, 6))
+    monkeypatch.setattr(scraper, "iter_newest_papers", feed)
+    return scraper, feed
+
+
+def test_query_key():
+    """Test that plain keyword queries are order- and case-insensitive"""
+    assert query_key("Quantum  computing") == query_key("computing quantum")
+    assert query_key("ti:quantum AND au:smith") != query_key("au:smith AND ti:quantum")
+
+
+def test_first_poll_then_only_new_papers(tmp_path, feed):
+    """Test cursor-based delta delivery to the inbox"""
+    scraper, fake = feed
+    manager = SubscriptionManager(tmp_path, scraper)
+    subscription = manager.register("quantum", max_results=3)
+
+    assert manager.poll() == {subscription.id: 3}
+    assert [p.title for p in manager.read_inbox(subscription.id, clear=True)] == [
+        "Paper 3", "Paper 4", "Paper 5"
+    ]
+
+    fake.numbers += [6, 7]
+    assert manager.poll() == {subscription.id: 2}
+    assert fake.calls[-1][1]["start_date"] == "2023-12-29"  # a week before the cursor
+    assert [p.title for p in manager.read_inbox(subscription.id)] == ["Paper 6", "Paper 7"]
+
+    assert manager.poll() == {subscription.id: 0}
+
+
+def test_incremental_poll_delivers_every_new_paper(tmp_path, feed):
+    """Test that more new papers than max_results are delivered rather than skipped"""
+    scraper, fake = feed
+    manager = SubscriptionManager(tmp_path, scraper)
+    subscription = manager.register("quantum", max_results=2)
+    manager.poll()
+    manager.read_inbox(subscription.id, clear=True)
+
+    fake.numbers += [6, 7, 8, 9]
+    assert manager.poll() == {subscription.id: 4}
+    assert fake.calls[-1][2] is None
+    assert [p.title for p in manager.read_inbox(subscription.id)] == [
+        "Paper 6", "Paper 7", "Paper 8", "Paper 9"
+    ]
+    assert subscription.cursor == ("2024-01-09", "2401.00009")
+
+
+def test_late_announced_paper_is_delivered(tmp_path, feed):
+    """Test that a paper older than the cursor is delivered once it shows up"""
+    scraper, fake = feed
+    manager = SubscriptionManager(tmp_path, scraper)
+    subscription = manager.register("quantum", max_results=10)
+    assert manager.poll() == {subscription.id: 5}
+
+    fake.numbers.append(8)
+    fake.published[8] = "2024-01-03"
+    assert manager.poll() == {subscription.id: 1}
+    assert manager.read_inbox(subscription.id)[-1].title == "Paper 8"
+    assert subscription.cursor == ("2024-01-05", "2401.00005")
+    assert manager.poll() == {subscription.id: 0}
+
+
+def test_lookback_skips_papers_cut_by_first_poll(tmp_path, feed):
+    """Test that papers left out by the first poll's max_results are not delivered later"""
+    scraper, fake = feed
+    manager = SubscriptionManager(tmp_path, scraper)
+    subscription = manager.register("quantum", max_results=2)
+    manager.poll()
+
+    assert manager.poll() == {subscription.id: 0}
+    assert fake.consumed == 2 + 5  # the second poll re-reads the whole window
+
+
+def test_delivered_ids_are_pruned(tmp_path, feed):
+    """Test that papers older than the lookback window are forgotten"""
+    scraper, fake = feed
+    manager = SubscriptionManager(tmp_path, scraper)
+    subscription = manager.register("quantum", max_results=10)
+    manager.poll()
+
+    fake.numbers.append(20)
+    manager.poll()
+    assert subscription.delivered == {"2401.00020": "2024-01-20"}
+    assert subscription.floor is None
+
+
+def test_equivalent_queries_share_one_request(tmp_path, feed):
+    """Test that subscriptions with the same normalized query are fused"""
+    scraper, fake = feed
+    manager = SubscriptionManager(tmp_path, scraper)
+    first = manager.register("quantum computing", max_results=2)
+    second = manager.register("Computing Quantum", max_results=4, delivery="file", target=str(tmp_path / "out.jsonl"))
+
+    assert manager.poll() == {first.id: 2, second.id: 4}
+    assert len(fake.calls) == 1
+    assert len((tmp_path / "out.jsonl").read_text().splitlines()) == 4
+    assert manager.stats.upstream_requests == 1
+    assert manager.stats.naive_requests == 2
+    assert manager.stats.requests_saved == 1
+    # The shared page is counted in full, not just the entries consumed
+    page_size = scraper.client.page_size
+    assert manager.stats.entries_fetched == page_size
+    assert manager.stats.naive_entries == 2 * page_size
+
+
+def test_exhausted_feed_counts_exact_entries(tmp_path, feed):
+    """Test that a result set that runs out is counted entry by entry"""
+    scraper, _ = feed
+    manager = SubscriptionManager(tmp_path, scraper)
+    manager.register("quantum", max_results=10)
+    manager.poll()
+    assert manager.stats.entries_fetched == 5
+
+
+def test_poll_due_respects_interval(tmp_path, feed):
+    """Test scheduling of polls"""
+    scraper, fake = feed
+    manager = SubscriptionManager(tmp_path, scraper)
+    manager.register("quantum", interval_minutes=60)
+    now = datetime(2024, 1, 10, 9, 0)
+
+    manager.poll_due(now)
+    assert manager.poll_due(now + timedelta(minutes=30)) == {}
+    assert len(manager.poll_due(now + timedelta(minutes=61))) == 1
+    assert len(fake.calls) == 2
+
+
+def test_failed_delivery_keeps_cursor(tmp_path, feed, monkeypatch):
+    """Test that papers are redelivered when a webhook fails"""
+    import requests
+
+    scraper, _ = feed
+    manager = SubscriptionManager(tmp_path, scraper)
+    subscription = manager.register("quantum", delivery="webhook", target="http://127.0.0.1:9/hook")
+
+    def refuse(*args, **kwargs):
+        raise requests.ConnectionError("refused")
+
+    monkeypatch.setattr(requests, "post", refuse)
+    assert manager.poll() == {subscription.id: 0}
+    assert subscription.cursor is None
+
+
+def test_state_survives_restart(tmp_path, feed):
+    """Test that cursors and stats are persisted"""
+    scraper, _ = feed
+    manager = SubscriptionManager(tmp_path, scraper)
+    subscription = manager.register("quantum")
+    manager.poll()
+
+    reopened = SubscriptionManager(tmp_path, scraper)
+    assert reopened.subscriptions[subscription.id].cursor == ("2024-01-05", "2401.00005")
+    assert set(reopened.subscriptions[subscription.id].delivered) == {
+        f"2401.{number:05d}" for number in range(1, 6)
+    }
+    assert reopened.stats.papers_delivered == 5
+    assert json.loads((tmp_path / "subscriptions.json").read_text())["stats"]["polls"] == 1
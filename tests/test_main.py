@@ -0,0 +1,105 @@
+"""Tests for the FastAPI backend."""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+# Add the project root to Python path
+project_root = str(Path(__file__).parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from src import main
+from src.scraper.authors import AuthorIndex
+from src.scraper.similarity import SimilarityIndex
+from tests.conftest import make_paper
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Provide a test client whose scraper never touches the network."""
+    def fake_iter_papers(query, max_results=None, date_range=None, sort_by="relevance"):
+        for i in range(max_results or 3):
+            yield make_paper(i, title=f"{query} {i}")
+
+    monkeypatch.setattr(main.scraper, "iter_papers", fake_iter_papers)
+    return TestClient(main.app)
+
+
+def test_export_streams_jsonl(client):
+    """Test streamed JSONL download"""
+    response = client.get("/export", params={"query": "quantum", "max_results": 4})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert len(response.text.splitlines()) == 4
+
+
+def test_export_rejects_bad_compression(client):
+    """Test that invalid options fail before streaming starts"""
+    response = client.get("/export", params={"query": "quantum", "format": "csv", "compression": "lz4"})
+    assert response.status_code == 400
+
+
+def test_related_endpoint(client, monkeypatch):
+    """Test related papers served from a local similarity index"""
+    index = SimilarityIndex(n_features=2 ** 16)
+    index.add([
+        make_paper(i, title, title)
+        for i, title in enumerate(["quantum codes", "quantum memory codes", "galaxy dynamics"])
+    ])
+    monkeypatch.setattr(main.scraper, "similarity_index", index)
+
+    response = client.get("/paper/2401.00000/related", params={"k": 5})
+    assert response.status_code == 200
+    assert [item["paper_id"] for item in response.json()["related"]] == ["2401.00001"]
+
+
+def test_authors_endpoint_answers_covered_ranges_locally(client, monkeypatch):
+    """Test author lookups served from the author index without upstream calls"""
+    index = AuthorIndex()
+    index.add([make_paper(1, "Notes on the Analytical Engine", publication_date="1843-09-01")])
+    index.mark_covered(["Ada Lovelace"], "1843-01-01", "1843-12-31")
+    monkeypatch.setattr(main.scraper, "author_index", index)
+    monkeypatch.setattr(main.scraper.client, "results", pytest.fail)
+
+    response = client.get(
+        "/authors/papers",
+        params={"author": ["Lovelace, A."], "start_date": "1843-01-01", "end_date": "1843-12-31"},
+    )
+    assert response.status_code == 200
+    assert [p["title"] for p in response.json()["papers"]] == ["Notes on the Analytical Engine"]
+
+
+def test_export_rejects_malformed_dates(client):
+    """Test that a bad date fails validation before the export starts streaming"""
+    response = client.get(
+        "/export", params={"query": "quantum", "start_date": "2024-01-01", "end_date": "2024-02-30"}
+    )
+    assert response.status_code == 422
+
+
+def test_authors_endpoint_rejects_malformed_dates(client):
+    """Test that a bad date is a client error rather than an empty result"""
+    response = client.get("/authors/papers", params={"author": ["Ada Lovelace"], "start_date": "2024-13-01"})
+    assert response.status_code == 422
+
+
+def test_shutdown_persists_similarity_index(monkeypatch, tmp_path):
+    """Test that papers indexed while serving are saved when the app shuts down"""
+    papers = [make_paper(i, title, title) for i, title in enumerate(["quantum codes", "quantum memory codes"])]
+    index = SimilarityIndex(tmp_path / "similarity", n_features=2 ** 16, compact_threshold=100)
+    index.add(papers[:1])
+    index.save()
+    monkeypatch.setattr(main, "PREWARM", False)
+    monkeypatch.setattr(main.scraper, "similarity_index", index)
+    monkeypatch.setattr(main.scraper, "author_index", AuthorIndex(tmp_path / "authors.jsonl"))
+
+    with TestClient(main.app):
+        index.add(papers[1:])  # stays in the in-memory delta
+    assert "2401.00001" in SimilarityIndex(tmp_path / "similarity")